@@ -0,0 +1,32 @@
+"""Add task keyset pagination indexes
+
+Revision ID: 3a9c5e21d7b4
+Revises: f152172746c6
+Create Date: 2026-10-17 10:12:04.318552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a9c5e21d7b4'
+down_revision: Union[str, Sequence[str], None] = 'f152172746c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('Task_createdAt_id_idx', 'Task', ['createdAt', 'id'], unique=False)
+    op.create_index('Task_projectId_createdAt_id_idx', 'Task', ['projectId', 'createdAt', 'id'], unique=False)
+    op.create_index('Task_projectId_position_id_idx', 'Task', ['projectId', 'position', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('Task_projectId_position_id_idx', table_name='Task')
+    op.drop_index('Task_projectId_createdAt_id_idx', table_name='Task')
+    op.drop_index('Task_createdAt_id_idx', table_name='Task')
@@ -0,0 +1,28 @@
+"""Add User.tokenVersion for access token revocation
+
+Revision ID: 7d2e4b9f1c08
+Revises: 3a9c5e21d7b4
+Create Date: 2026-10-17 14:41:27.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e4b9f1c08'
+down_revision: Union[str, Sequence[str], None] = '3a9c5e21d7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('User', sa.Column('tokenVersion', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('User', 'tokenVersion')
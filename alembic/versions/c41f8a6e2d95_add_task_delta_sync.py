@@ -0,0 +1,42 @@
+"""Add task delta sync index and TaskTombstone table
+
+Revision ID: c41f8a6e2d95
+Revises: 7d2e4b9f1c08
+Create Date: 2026-10-17 18:05:43.610277
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f8a6e2d95'
+down_revision: Union[str, Sequence[str], None] = '7d2e4b9f1c08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('Task_projectId_updatedAt_id_idx', 'Task', ['projectId', 'updatedAt', 'id'], unique=False)
+    op.create_table(
+        'TaskTombstone',
+        sa.Column('id', sa.Text(), nullable=False),
+        sa.Column('projectId', sa.Text(), nullable=False),
+        sa.Column('deletedAt', postgresql.TIMESTAMP(precision=3), nullable=False),
+        sa.ForeignKeyConstraint(['projectId'], ['Project.id'], name='TaskTombstone_projectId_fkey', onupdate='CASCADE', ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id', name='TaskTombstone_pkey'),
+    )
+    op.create_index('TaskTombstone_deletedAt_idx', 'TaskTombstone', ['deletedAt'], unique=False)
+    op.create_index('TaskTombstone_projectId_deletedAt_id_idx', 'TaskTombstone', ['projectId', 'deletedAt', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('TaskTombstone_projectId_deletedAt_id_idx', table_name='TaskTombstone')
+    op.drop_index('TaskTombstone_deletedAt_idx', table_name='TaskTombstone')
+    op.drop_table('TaskTombstone')
+    op.drop_index('Task_projectId_updatedAt_id_idx', table_name='Task')
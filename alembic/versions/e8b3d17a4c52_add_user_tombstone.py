@@ -0,0 +1,36 @@
+"""Add UserTombstone table for revoking deleted users' tokens
+
+Revision ID: e8b3d17a4c52
+Revises: c41f8a6e2d95
+Create Date: 2026-10-17 21:14:08.392614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3d17a4c52'
+down_revision: Union[str, Sequence[str], None] = 'c41f8a6e2d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'UserTombstone',
+        sa.Column('id', sa.Text(), nullable=False),
+        sa.Column('deletedAt', postgresql.TIMESTAMP(precision=3), nullable=False),
+        sa.PrimaryKeyConstraint('id', name='UserTombstone_pkey'),
+    )
+    op.create_index('UserTombstone_deletedAt_idx', 'UserTombstone', ['deletedAt'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('UserTombstone_deletedAt_idx', table_name='UserTombstone')
+    op.drop_table('UserTombstone')
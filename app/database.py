@@ -1,9 +1,20 @@
 import os
+import asyncio
+import itertools
 import logging
+from contextlib import asynccontextmanager
+from functools import partial
 from urllib.parse import quote
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, raiseload, sessionmaker
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
 from dotenv import load_dotenv
+from app.utils.profiling import run_in_threadpool
+from app.utils.pool_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_pool
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +22,11 @@ logger = logging.getLogger(__name__)
 # This is a no-op in Docker but necessary for local development
 load_dotenv()
 
+# "sync" runs queries through the psycopg2 engine, offloading each call to the
+# threadpool; "async" uses the native psycopg 3 async driver.
+DATABASE_MODE = os.getenv("DATABASE_MODE", "sync").lower()
+
+
 def _format_host_for_url(host: str | None) -> str | None:
     """Format host for use in PostgreSQL URL, handling IPv6 addresses."""
     if host is None:
@@ -55,26 +71,345 @@ def get_database_url():
     formatted_host = _format_host_for_url(db_host)
     return f"postgresql://{db_user}:{encoded_password}@{formatted_host}:{db_port}/{db_name}"
 
+def get_async_database_url(url: str) -> str:
+    """Rewrite a PostgreSQL URL to use the psycopg 3 async driver."""
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return url
+    if scheme in ("postgres", "postgresql") or scheme.startswith("postgresql+"):
+        return f"postgresql+psycopg://{rest}"
+    return url
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_pool_options() -> dict:
+    """Build connection pool keyword arguments from environment variables."""
+    return {
+        "pool_size": int(os.getenv("DATABASE_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "30")),
+        # -1 disables recycling; set below the server/proxy idle timeout
+        "pool_recycle": int(os.getenv("DATABASE_POOL_RECYCLE", "-1")),
+        "pool_pre_ping": _env_bool("DATABASE_POOL_PRE_PING", False),
+        # LIFO keeps a small hot set of connections and lets the rest idle out
+        "pool_use_lifo": _env_bool("DATABASE_POOL_USE_LIFO", False),
+    }
+
+
 DATABASE_URL = get_database_url()
 if DATABASE_URL:
     logger.info(f"Database URL configured: {DATABASE_URL[:60]}...")
 else:
     logger.warning("No DATABASE_URL configured!")
 
+# Comma-separated read replica URLs; reads fall back to the primary when empty
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+DATABASE_REPLICA_HEALTH_INTERVAL = float(os.getenv("DATABASE_REPLICA_HEALTH_INTERVAL", "10"))
+
+# Session.info key that routes every remaining statement to the primary
+USE_PRIMARY = "use_primary"
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Make relationships that were not eagerly loaded raise on access instead of
+# lazily emitting a query per object (N+1)
+DATABASE_STRICT_LOADING = _env_bool("DATABASE_STRICT_LOADING", False)
+
+
+def _ping(sync_engine):
+    with sync_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+class ReplicaSet:
+    """Round-robin selection over the read replicas that are currently healthy.
+
+    Replicas join the rotation once a health check succeeds (the first runs
+    at startup). A replica is taken out of rotation when it raises a
+    disconnect error and put back once a periodic health check succeeds again.
+    """
+
+    def __init__(self):
+        self.engines = []
+        self._healthy = []
+        self._counter = itertools.count()
+
+    def add(self, replica_engine):
+        index = len(self.engines)
+        self.engines.append(replica_engine)
+        self._healthy.append(False)
+        sync_engine = getattr(replica_engine, "sync_engine", replica_engine)
+        event.listen(sync_engine, "handle_error", partial(self._on_error, index))
+
+    def _on_error(self, index, context):
+        # connection is None when the failure happened while connecting
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(index)
+
+    def mark_down(self, index: int):
+        if self._healthy[index]:
+            logger.warning(f"Read replica {index} marked unhealthy")
+        self._healthy[index] = False
+
+    def mark_up(self, index: int):
+        if not self._healthy[index]:
+            logger.info(f"Read replica {index} healthy")
+        self._healthy[index] = True
+
+    def _sync_engine(self, index: int):
+        return getattr(self.engines[index], "sync_engine", self.engines[index])
+
+    def mark_engine_down(self, sync_engine):
+        """Take the replica behind a sync Engine returned by choose() out of rotation."""
+        for index in range(len(self.engines)):
+            if self._sync_engine(index) is sync_engine:
+                self.mark_down(index)
+
+    def choose(self, exclude=()):
+        """Return the next healthy replica's sync Engine not in exclude, or None."""
+        count = len(self.engines)
+        if count == 0:
+            return None
+        start = next(self._counter)
+        for offset in range(count):
+            index = (start + offset) % count
+            if self._healthy[index] and self._sync_engine(index) not in exclude:
+                return self._sync_engine(index)
+        return None
+
+    async def check_health(self):
+        """Probe every replica with SELECT 1 and update its health."""
+        for index, replica_engine in enumerate(self.engines):
+            try:
+                if isinstance(replica_engine, AsyncEngine):
+                    async with replica_engine.connect() as conn:
+                        await conn.execute(text("SELECT 1"))
+                else:
+                    await run_in_threadpool(_ping, replica_engine)
+            except Exception as e:
+                logger.debug(f"Read replica {index} health check failed: {e}")
+                self.mark_down(index)
+            else:
+                self.mark_up(index)
+
+    async def dispose(self):
+        for replica_engine in self.engines:
+            if isinstance(replica_engine, AsyncEngine):
+                await replica_engine.dispose()
+            else:
+                replica_engine.dispose()
+
+
+async def run_replica_health_checks():
+    """Background task: periodically re-check replica health."""
+    while True:
+        await asyncio.sleep(DATABASE_REPLICA_HEALTH_INTERVAL)
+        await replicas.check_health()
+
+
+def raise_on_lazy_load(orm_execute_state):
+    """do_orm_execute hook adding raiseload("*") to top-level ORM SELECTs.
+
+    Relationships loaded explicitly (selectinload, joinedload, ...) are
+    unaffected; touching any other relationship raises InvalidRequestError.
+    """
+    if orm_execute_state.is_select and not orm_execute_state.is_relationship_load:
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+
+def enable_strict_loading(target):
+    """Apply raise_on_lazy_load to a Session class, sessionmaker or session."""
+    event.listen(target, "do_orm_execute", raise_on_lazy_load)
+
+
+def _is_plain_select(clause) -> bool:
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+class RoutingSession(Session):
+    """Session that sends plain SELECTs to a read replica.
+
+    One replica is picked per session. Flushes, DML, locking reads and any
+    statement after the first write go to the primary, so a request always
+    reads its own writes. The replica's connection is opened when it is
+    picked; if that fails the next healthy replica is tried, then the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if kw.get("bind") is None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info[USE_PRIMARY] = True
+            elif not self.info.get(USE_PRIMARY) and _is_plain_select(clause):
+                replica = self.info.get("replica")
+                if replica is None:
+                    replica = self._connect_replica()
+                    self.info["replica"] = replica
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def _connect_replica(self):
+        """Return a replica whose connection opened, or None to use the primary."""
+        failed = set()
+        while (replica := replicas.choose(exclude=failed)) is not None:
+            try:
+                self.connection(bind_arguments={"bind": replica})
+            except DBAPIError as e:
+                logger.warning(f"Read replica connection failed, retrying elsewhere: {e}")
+                replicas.mark_engine_down(replica)
+                failed.add(replica)
+            else:
+                return replica
+        # Every replica failed; stay on the primary for the rest of the session
+        self.info[USE_PRIMARY] = True
+        return None
+
+
+pool_options = get_pool_options()
+logger.info(f"Database pool options: {pool_options}")
+
 try:
-    engine = create_engine(DATABASE_URL, echo=False)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine = create_engine(DATABASE_URL, echo=False, poolclass=TimedQueuePool, **pool_options)
+    SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+    if DATABASE_STRICT_LOADING:
+        # Covers AsyncSessionLocal too, whose sync sessions are RoutingSessions
+        enable_strict_loading(RoutingSession)
     Base = declarative_base()
-    logger.info("Database engine created successfully")
+
+    replicas = ReplicaSet()
+    async_engine = None
+    AsyncSessionLocal = None
+    if DATABASE_MODE == "async":
+        async_engine = create_async_engine(
+            get_async_database_url(DATABASE_URL),
+            echo=False,
+            poolclass=TimedAsyncAdaptedQueuePool,
+            **pool_options,
+        )
+        # Attributes must stay loaded after commit: lazy loads cannot run
+        # implicitly on the event loop.
+        AsyncSessionLocal = async_sessionmaker(
+            async_engine,
+            sync_session_class=RoutingSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        instrument_pool("primary", async_engine.sync_engine.pool)
+        for index, url in enumerate(DATABASE_REPLICA_URLS):
+            replica_engine = create_async_engine(
+                get_async_database_url(url),
+                echo=False,
+                poolclass=TimedAsyncAdaptedQueuePool,
+                **pool_options,
+            )
+            instrument_pool(f"replica-{index}", replica_engine.sync_engine.pool)
+            replicas.add(replica_engine)
+    elif DATABASE_MODE == "sync":
+        instrument_pool("primary", engine.pool)
+        for index, url in enumerate(DATABASE_REPLICA_URLS):
+            replica_engine = create_engine(url, echo=False, poolclass=TimedQueuePool, **pool_options)
+            instrument_pool(f"replica-{index}", replica_engine.pool)
+            replicas.add(replica_engine)
+    else:
+        raise ValueError(f"Unknown DATABASE_MODE: {DATABASE_MODE!r} (expected 'sync' or 'async')")
+    logger.info(
+        f"Database engine created successfully "
+        f"(mode: {DATABASE_MODE}, replicas: {len(replicas.engines)})"
+    )
 except Exception as e:
     logger.error(f"Failed to create database engine: {e}")
     raise
 
 
-def get_db():
-    """Dependency for FastAPI to get database session."""
-    db = SessionLocal()
+class ThreadpoolSession:
+    """Awaitable wrapper around a sync Session.
+
+    Mirrors the subset of the AsyncSession API used by the routes so handlers
+    are written once; every call that may touch the database runs in the
+    threadpool instead of on the event loop.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    @property
+    def info(self) -> dict:
+        return self.sync_session.info
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def refresh(self, instance, *args, **kwargs):
+        await run_in_threadpool(self.sync_session.refresh, instance, *args, **kwargs)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self, *args, **kwargs):
+        await run_in_threadpool(self.sync_session.flush, *args, **kwargs)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+
+@asynccontextmanager
+async def session_scope(use_primary: bool = True):
+    """Open a database session outside of a request (e.g. in background tasks).
+
+    Yields the same awaitable session type as get_db.
+    """
+    if DATABASE_MODE == "async":
+        async with AsyncSessionLocal() as db:
+            db.info[USE_PRIMARY] = use_primary
+            yield db
+        return
+
+    db = ThreadpoolSession(SessionLocal())
+    db.info[USE_PRIMARY] = use_primary
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+async def get_db(request: Request):
+    """Dependency for FastAPI to get database session.
+
+    Yields an AsyncSession in async mode, or a ThreadpoolSession wrapping a
+    sync Session otherwise. Both expose the same awaitable API. Reads in
+    GET/HEAD/OPTIONS requests may be served by a read replica; every other
+    request uses the primary throughout.
+    """
+    async with session_scope(use_primary=request.method not in READ_ONLY_METHODS) as db:
+        yield db
@@ -1,34 +1,184 @@
-from fastapi import Depends, HTTPException, status
+import os
+import asyncio
+import hashlib
+import logging
+import secrets
+import time
+from dataclasses import dataclass
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import User
-from app.utils.jwt import decode_access_token
+from datetime import datetime, timedelta
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, session_scope
+from app.models import User, UserTombstone
+from app.utils.cache import TTLCache
+from app.utils.jwt import ACCESS_TOKEN_EXPIRE_DAYS, decode_access_token_payload, stateless_tokens_enabled
+from app.utils.revocation import token_versions
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
+# How often workers reload revoked token versions from the database; a token
+# revoked on another worker can be served from principal_cache until then
+TOKEN_VERSION_REFRESH_SECONDS = float(os.getenv("JWT_REVOCATION_REFRESH_SECONDS", "30"))
+
+
+@dataclass(frozen=True, slots=True)
+class AuthenticatedUser:
+    """Lightweight snapshot of the authenticated user, safe to cache across requests."""
+    id: str
+    email: str
+    firstName: str | None
+    lastName: str | None
+    tokenVersion: int = 0
+
+
+# Decoded principals keyed by SHA-256 of the bearer token; 0 disables caching
+principal_cache = TTLCache(
+    maxsize=int(os.getenv("AUTH_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("AUTH_CACHE_TTL", "60")),
+)
+
+
+def invalidate_user(user_id: str) -> int:
+    """Drop cached principals for a user, e.g. after the user is updated or deleted."""
+    return principal_cache.discard_where(lambda principal: principal.id == user_id)
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_cached_user(mapper, connection, target):
+    invalidate_user(target.id)
+
+
+@event.listens_for(User, "after_delete")
+def _revoke_deleted_user(mapper, connection, target):
+    invalidate_user(target.id)
+    token_versions.mark_deleted(target.id)
+    # Written in the deleting transaction so other workers pick it up on refresh
+    connection.execute(insert(UserTombstone).values(id=target.id, deletedAt=datetime.utcnow()))
+
+
+async def refresh_token_versions(db: AsyncSession) -> int:
+    """Reload the revocation map from User.tokenVersion and UserTombstone; returns the number of revoked users."""
+    rows = (await db.execute(
+        select(User.id, User.tokenVersion).where(User.tokenVersion > 0)
+    )).all()
+    # Tokens of users deleted longer ago than the token lifetime have expired
+    oldest = datetime.utcnow() - timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
+    deleted = (await db.scalars(
+        select(UserTombstone.id).where(UserTombstone.deletedAt >= oldest)
+    )).all()
+    token_versions.replace({user_id: version for user_id, version in rows}, set(deleted))
+    return len(rows) + len(deleted)
+
+
+async def run_token_version_refresh():
+    """Background task: keep the revocation map in step with the database."""
+    while True:
+        await asyncio.sleep(TOKEN_VERSION_REFRESH_SECONDS)
+        try:
+            async with session_scope(use_primary=False) as db:
+                await refresh_token_versions(db)
+        except Exception:
+            logger.exception("Failed to refresh token versions")
+
+
+def _revoked() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token has been revoked",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _principal_from_claims(payload: dict) -> AuthenticatedUser | None:
+    """Build the principal from a stateless token, or None if it lacks the claims."""
+    if "ver" not in payload or "email" not in payload:
+        return None
+    return AuthenticatedUser(
+        id=payload["sub"],
+        email=payload["email"],
+        firstName=payload.get("given_name"),
+        lastName=payload.get("family_name"),
+        tokenVersion=payload["ver"],
+    )
+
 
 async def get_current_user(
     credentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    """Extract and validate JWT token from Authorization header, return User object."""
+    db: AsyncSession = Depends(get_db),
+) -> AuthenticatedUser:
+    """Extract and validate JWT token from Authorization header, return the authenticated user.
+
+    Principals are cached per token for up to AUTH_CACHE_TTL seconds (never
+    past the token's expiry), skipping both the signature check and the
+    User lookup on a hit. With JWT_TOKEN_MODE=stateless the principal is
+    read from the token's claims and checked against the in-memory
+    revocation map instead of the database.
+    """
     token = credentials.credentials
+    cache_key = hashlib.sha256(token.encode()).digest()
+
+    principal = principal_cache.get(cache_key)
+    if principal is not None:
+        if token_versions.is_revoked(principal.id, principal.tokenVersion):
+            raise _revoked()
+        return principal
 
-    user_id = decode_access_token(token)
-    if user_id is None:
+    payload = decode_access_token_payload(token)
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
+    version = payload.get("ver", 0)
+    principal = _principal_from_claims(payload) if stateless_tokens_enabled() else None
+    if principal is not None:
+        if token_versions.is_revoked(principal.id, version):
+            raise _revoked()
+    else:
+        row = (await db.execute(
+            select(User.id, User.email, User.firstName, User.lastName, User.tokenVersion)
+            .where(User.id == payload["sub"])
+        )).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if version < row.tokenVersion:
+            raise _revoked()
+        principal = AuthenticatedUser(row.id, row.email, row.firstName, row.lastName, version)
+
+    expires_at = None
+    if "exp" in payload:
+        expires_at = time.monotonic() + (payload["exp"] - time.time())
+    principal_cache.set(cache_key, principal, expires_at=expires_at)
+    return principal
+
+
+def require_internal_token(
+    x_internal_token: str | None = Header(default=None),
+    authorization: str | None = Header(default=None),
+) -> None:
+    """Guard internal/operational endpoints with the INTERNAL_API_TOKEN shared secret.
+
+    The secret is sent in X-Internal-Token, or as a bearer token for scrapers
+    that can only set Authorization. The endpoints are hidden (404) when no
+    token is configured.
+    """
+    expected = os.getenv("INTERNAL_API_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_internal_token is None and authorization and authorization.startswith("Bearer "):
+        x_internal_token = authorization.removeprefix("Bearer ")
+    if x_internal_token is None or not secrets.compare_digest(x_internal_token, expected):
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid internal token",
         )
-
-    return user
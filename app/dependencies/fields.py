@@ -0,0 +1,31 @@
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+
+
+def sparse_fields(schema: type[BaseModel]):
+    """Build a dependency parsing the ?fields= query parameter for a response schema.
+
+    Returns the requested field names in schema order (always including
+    "id"), or None when the parameter is absent.
+    """
+    allowed = tuple(schema.model_fields)
+
+    def dependency(
+        fields: str | None = Query(
+            default=None,
+            description=f"Comma-separated subset of: {', '.join(allowed)}",
+        ),
+    ) -> tuple[str, ...] | None:
+        if not fields:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        requested.add("id")
+        return tuple(name for name in allowed if name in requested)
+
+    return dependency
@@ -1,17 +1,49 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
+import asyncio
 import logging
+from contextlib import nullcontext
+from starlette.concurrency import run_in_threadpool
+from app.database import DATABASE_URL, async_engine, replicas, run_replica_health_checks, session_scope
+from app.dependencies.auth import refresh_token_versions, run_token_version_refresh
 from app.routes.projects import router as projects_router
 from app.routes.users import router as users_router
 from app.routes.tasks import router as tasks_router
+from app.routes.internal import router as internal_router
+from app.routes.metrics import router as metrics_router
+from app.routes.realtime import router as realtime_router
+from app.utils.delta_sync import run_tombstone_pruning
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.profiling import PROFILE_FILE_HEADER, ProfilingMiddleware, request_profiler
+from app.utils.prometheus import (
+    METRICS_MULTIPROC_DIR,
+    request_metrics,
+    route_template,
+    run_metrics_flush,
+    write_worker_snapshot,
+)
+from app.utils.query_budget import check_query_budget
+from app.utils.realtime import REALTIME_BACKEND, NotifyListener, broker
+from app.utils.request_stats import track_request
+from app.utils.response_cache import CACHE_STATUS_HEADER, response_cache
+from app.utils.slow_queries import slow_query_log
+from app.utils.security import PasswordHasherBusy, bcrypt_pool, calibrate_bcrypt_rounds
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+request_logger = logging.getLogger("app.requests")
+
+# Server-Timing reveals database timings to clients; disable it on public deployments if unwanted
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in ("1", "true", "yes", "on")
 
 app = FastAPI()
 
+# Innermost middleware, so it runs inside the task call_next starts per request
+app.add_middleware(ProfilingMiddleware)
+
 # Configure CORS
 allowed_origins = os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
 logger.info(f"CORS origins: {allowed_origins}")
@@ -22,17 +54,95 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", CACHE_STATUS_HEADER, "Server-Timing", PROFILE_FILE_HEADER],
 )
 
 
+@app.middleware("http")
+async def request_stats_middleware(request: Request, call_next):
+    """Count SQL statements and database time per request.
+
+    Adds a Server-Timing header, logs one key=value line per request,
+    records the request in the /metrics counters under its route template
+    and checks the route's @query_budget. Requests selected by the request
+    profiler are profiled by ProfilingMiddleware.
+    """
+    route = route_template(app.router.routes, request.scope)
+    request_metrics.started(request.method, route)
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    profiling = request_profiler.should_profile(request.headers, route)
+    with track_request(route) as stats:
+        try:
+            with request_profiler.profile() if profiling else nullcontext() as request_profile:
+                response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            request_metrics.finished(request.method, route, status_code, stats.elapsed)
+        if profiling:
+            filename = await run_in_threadpool(request_profiler.write, request_profile, request.method, route)
+            if filename:
+                response.headers[PROFILE_FILE_HEADER] = filename
+        check_query_budget(request.scope.get("endpoint"), route, stats.queries)
+        if SERVER_TIMING_ENABLED:
+            response.headers["Server-Timing"] = stats.server_timing()
+        request_logger.info(
+            f"method={request.method} path={request.url.path} status={response.status_code} "
+            f"duration_ms={stats.elapsed * 1000:.1f} db_queries={stats.queries} "
+            f"db_ms={stats.db_time * 1000:.1f}"
+        )
+    return response
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many concurrent authentication requests, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("Application startup - FastAPI app initialized")
+    await bcrypt_pool.run(calibrate_bcrypt_rounds)
+    if replicas.engines:
+        # Replicas only take reads once they have answered a probe
+        await replicas.check_health()
+        app.state.replica_health_task = asyncio.create_task(run_replica_health_checks())
+    # Both modes check cached principals against the map, so revocations made
+    # on other workers apply within JWT_REVOCATION_REFRESH_SECONDS
+    async with session_scope(use_primary=False) as db:
+        revoked = await refresh_token_versions(db)
+    logger.info(f"Loaded revoked token versions for {revoked} users")
+    app.state.token_version_task = asyncio.create_task(run_token_version_refresh())
+    if METRICS_MULTIPROC_DIR:
+        app.state.metrics_flush_task = asyncio.create_task(run_metrics_flush())
+    app.state.tombstone_pruning_task = asyncio.create_task(run_tombstone_pruning())
+    if REALTIME_BACKEND == "postgres" and DATABASE_URL and DATABASE_URL.startswith("postgres"):
+        app.state.realtime_listener = NotifyListener(DATABASE_URL, broker)
+        app.state.realtime_listener_task = asyncio.create_task(app.state.realtime_listener.run())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Application shutdown")
+    for task_name in (
+        "replica_health_task", "token_version_task", "metrics_flush_task",
+        "tombstone_pruning_task", "realtime_listener_task",
+    ):
+        task = getattr(app.state, task_name, None)
+        if task is not None:
+            task.cancel()
+    if METRICS_MULTIPROC_DIR:
+        # Keep this worker's counters in the aggregate after it exits
+        write_worker_snapshot(METRICS_MULTIPROC_DIR)
+    bcrypt_pool.shutdown()
+    slow_query_log.shutdown()
+    await response_cache.close()
+    await replicas.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 @app.get("/")
@@ -42,4 +152,7 @@ def read_root():
 
 app.include_router(projects_router, prefix="/projects", tags=["projects"])
 app.include_router(users_router, prefix="/users", tags=["users"])
-app.include_router(tasks_router, prefix="/tasks", tags=["tasks"])
\ No newline at end of file
+app.include_router(tasks_router, prefix="/tasks", tags=["tasks"])
+app.include_router(realtime_router, tags=["realtime"])
+app.include_router(internal_router, prefix="/internal", tags=["internal"], include_in_schema=False)
+app.include_router(metrics_router, tags=["internal"], include_in_schema=False)
\ No newline at end of file
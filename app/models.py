@@ -40,6 +40,7 @@ class User(Base):
     firstName: Mapped[Optional[str]] = mapped_column(Text)
     lastName: Mapped[Optional[str]] = mapped_column(Text)
     avatar: Mapped[Optional[str]] = mapped_column(Text)
+    tokenVersion: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text('0'))
 
     Notification: Mapped[list['Notification']] = relationship('Notification', back_populates='User_')
     Project: Mapped[list['Project']] = relationship('Project', back_populates='User_')
@@ -137,9 +138,13 @@ class Task(Base):
         ForeignKeyConstraint(['projectId'], ['Project.id'], ondelete='CASCADE', onupdate='CASCADE', name='Task_projectId_fkey'),
         PrimaryKeyConstraint('id', name='Task_pkey'),
         Index('Task_assigneeId_idx', 'assigneeId'),
+        Index('Task_createdAt_id_idx', 'createdAt', 'id'),
         Index('Task_creatorId_idx', 'creatorId'),
         Index('Task_dueDate_idx', 'dueDate'),
-        Index('Task_projectId_status_idx', 'projectId', 'status')
+        Index('Task_projectId_createdAt_id_idx', 'projectId', 'createdAt', 'id'),
+        Index('Task_projectId_position_id_idx', 'projectId', 'position', 'id'),
+        Index('Task_projectId_status_idx', 'projectId', 'status'),
+        Index('Task_projectId_updatedAt_id_idx', 'projectId', 'updatedAt', 'id')
     )
 
     id: Mapped[str] = mapped_column(Text, primary_key=True)
@@ -229,3 +234,30 @@ class TaskTag(Base):
 
     Tag_: Mapped['Tag'] = relationship('Tag', back_populates='TaskTag')
     Task_: Mapped['Task'] = relationship('Task', back_populates='TaskTag')
+
+
+class TaskTombstone(Base):
+    """Record of a deleted task, kept for delta sync (GET /tasks/changes)."""
+    __tablename__ = 'TaskTombstone'
+    __table_args__ = (
+        ForeignKeyConstraint(['projectId'], ['Project.id'], ondelete='CASCADE', onupdate='CASCADE', name='TaskTombstone_projectId_fkey'),
+        PrimaryKeyConstraint('id', name='TaskTombstone_pkey'),
+        Index('TaskTombstone_deletedAt_idx', 'deletedAt'),
+        Index('TaskTombstone_projectId_deletedAt_id_idx', 'projectId', 'deletedAt', 'id')
+    )
+
+    id: Mapped[str] = mapped_column(Text, primary_key=True)
+    projectId: Mapped[str] = mapped_column(Text, nullable=False)
+    deletedAt: Mapped[datetime.datetime] = mapped_column(TIMESTAMP(precision=3), nullable=False)
+
+
+class UserTombstone(Base):
+    """Record of a deleted user, so every worker revokes the user's stateless tokens."""
+    __tablename__ = 'UserTombstone'
+    __table_args__ = (
+        PrimaryKeyConstraint('id', name='UserTombstone_pkey'),
+        Index('UserTombstone_deletedAt_idx', 'deletedAt')
+    )
+
+    id: Mapped[str] = mapped_column(Text, primary_key=True)
+    deletedAt: Mapped[datetime.datetime] = mapped_column(TIMESTAMP(precision=3), nullable=False)
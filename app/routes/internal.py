@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.dependencies.auth import principal_cache, require_internal_token
+from app.schemas.internal import ProfilingArmRequest
+from app.utils.pool_metrics import get_pool_metrics
+from app.utils.profiling import request_profiler
+from app.utils.realtime import broker
+from app.utils.response_cache import response_cache
+from app.utils.security import bcrypt_pool
+from app.utils.slow_queries import slow_query_log
+
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+
+@router.get("/pool")
+def read_pool_metrics():
+    """Connection pool occupancy, counters and checkout wait-time histograms."""
+    return {"pools": get_pool_metrics()}
+
+
+@router.get("/auth-cache")
+def read_auth_cache_stats():
+    """Size and hit/miss counters of the authenticated-principal cache."""
+    return principal_cache.stats()
+
+
+@router.get("/bcrypt")
+def read_bcrypt_stats():
+    """bcrypt pool occupancy, rejections, queue-wait and hash-time histograms."""
+    return bcrypt_pool.stats()
+
+
+@router.get("/realtime")
+def read_realtime_stats():
+    """Realtime subscribers per process, delivered events and dropped slow consumers."""
+    return broker.stats()
+
+
+@router.get("/response-cache")
+def read_response_cache_stats():
+    """Backend, hit/miss counters and (in memory) size of the response cache."""
+    return response_cache.stats()
+
+
+@router.get("/slow-queries")
+def read_slow_queries():
+    """Recent statements over SLOW_QUERY_THRESHOLD_MS, newest first, with EXPLAIN output if captured."""
+    return {"queries": slow_query_log.recent()}
+
+
+@router.get("/profiling")
+def read_profiling_state():
+    """Armed routes, rate-limited skips and the most recent profile files."""
+    return {
+        "enabled": request_profiler.enabled,
+        "armed": request_profiler.armed,
+        "skipped": request_profiler.skipped,
+        "profiles": request_profiler.recent(),
+    }
+
+
+@router.post("/profiling")
+def arm_profiling(arm: ProfilingArmRequest):
+    """Profile the next N requests to a route template, e.g. /tasks/{task_id}."""
+    if not request_profiler.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profiling is disabled; set PROFILING_DIR",
+        )
+    request_profiler.arm(arm.route, arm.requests)
+    return {"armed": request_profiler.armed}
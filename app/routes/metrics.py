@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends, Response
+
+from app.dependencies.auth import require_internal_token
+from app.utils.prometheus import CONTENT_TYPE, exposition
+
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+
+@router.get("/metrics")
+def read_metrics():
+    """Request, connection pool and bcrypt metrics in Prometheus text format."""
+    return Response(content=exposition(), media_type=CONTENT_TYPE)
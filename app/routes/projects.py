@@ -1,26 +1,123 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from datetime import datetime
 from uuid import uuid4
-from app.models import Project, User
+from app.models import Project, ProjectMember
 from app.database import get_db
 from app.schemas.project import ProjectCreate, ProjectResponse
-from app.dependencies.auth import get_current_user
+from app.schemas.fields import sparse_response
+from app.dependencies.auth import AuthenticatedUser, get_current_user
+from app.dependencies.fields import sparse_fields
+from app.utils.conditional import (
+    cached_not_modified,
+    collection_etag,
+    not_modified,
+    resource_etag,
+    validator_headers,
+)
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+)
+from app.utils.query_budget import query_budget
+from app.utils.response_cache import response_cache, user_projects_scope
 
 router = APIRouter()
 
 
-@router.get("/")
-def read_projects(db: Session = Depends(get_db)):
-    projects = db.query(Project).all()
+# Cursor ordering name for project pagination
+PROJECT_ORDER = "created"
+
+PROJECT_RESPONSE_FIELDS = tuple(ProjectResponse.model_fields)
+
+
+@router.get("/", response_model=list[ProjectResponse])
+@query_budget(3)
+async def read_projects(
+    request: Request,
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = Depends(sparse_fields(ProjectResponse)),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """List projects the current user owns or is a member of. Requires authentication.
+
+    Paginated by keyset on (createdAt, id); the cursor for the next page is
+    returned in the X-Next-Cursor response header. With ?fields=, only the
+    listed columns are loaded and serialized. Served from the response
+    cache until the user creates a project. The ETag comes from count(*)
+    and max(updatedAt) over the user's projects; as for GET /tasks/, no
+    Last-Modified is sent, since losing a project changes no updatedAt.
+    """
+    params = [("limit", limit), ("cursor", cursor), ("fields", fields)]
+    cache_key, cached = await response_cache.lookup(
+        "read_projects", [user_projects_scope(current_user.id)], params
+    )
+    if cached is not None:
+        return cached_not_modified(request.headers, cached) or cached
+
+    after = None
+    if cursor:
+        after = decode_cursor(cursor, PROJECT_ORDER, datetime)
+        if after is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+    # The user's project ids come from two index lookups (Project_ownerId_idx
+    # and ProjectMember_userId_idx) combined by UNION, then Project rows are
+    # fetched by primary key and sorted, so cost scales with the user's
+    # projects. ownerId = :user OR id IN (...) would instead run the IN as a
+    # filter over a sequential scan of Project.
+    visible_ids = union(
+        select(Project.id).where(Project.ownerId == current_user.id),
+        select(ProjectMember.projectId).where(ProjectMember.userId == current_user.id),
+    )
+    visible = Project.id.in_(visible_ids)
+
+    count, last_modified = (await db.execute(
+        select(func.count(), func.max(Project.updatedAt)).where(visible)
+    )).one()
+    etag = collection_etag(count, last_modified, params)
+    unchanged = not_modified(request.headers, etag)
+    if unchanged is not None:
+        return unchanged
+    response.headers.update(validator_headers(etag, None))
+
+    query = select(Project).where(visible)
+    if fields:
+        loaded = {*fields, "createdAt"}
+        query = query.options(load_only(*(getattr(Project, name) for name in loaded)))
+    query = keyset_page(query, Project.createdAt, Project.id, after, limit)
+    projects = (await db.scalars(query)).all()
+
+    if len(projects) > limit:
+        projects = projects[:limit]
+        last = projects[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(PROJECT_ORDER, last.createdAt, last.id)
+
+    if fields or cache_key:
+        rendered = sparse_response(ProjectResponse, fields or PROJECT_RESPONSE_FIELDS, projects, response)
+        return await response_cache.store(cache_key, rendered)
     return [ProjectResponse.model_validate(project) for project in projects]
 
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
-def create_project(
+@query_budget(3)
+async def create_project(
     project: ProjectCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """Create a new project. Requires authentication."""
     now = datetime.utcnow()
@@ -36,7 +133,9 @@ def create_project(
     )
 
     db.add(new_project)
-    db.commit()
-    db.refresh(new_project)
+    await db.commit()
+    await db.refresh(new_project)
+    await response_cache.invalidate(user_projects_scope(current_user.id))
 
+    response.headers.update(validator_headers(resource_etag(new_project.updatedAt), new_project.updatedAt))
     return ProjectResponse.model_validate(new_project)
@@ -0,0 +1,92 @@
+import asyncio
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.utils.realtime import REALTIME_HEARTBEAT_SECONDS, REALTIME_SEND_TIMEOUT, broker
+
+router = APIRouter()
+
+# Close code for dropped subscribers: reconnect, then catch up via /tasks/changes
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+async def _forward_events(websocket: WebSocket, subscription):
+    while True:
+        message = await subscription.get()
+        if message is None:
+            await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Too far behind, resync")
+            return
+        try:
+            await asyncio.wait_for(websocket.send_text(message), REALTIME_SEND_TIMEOUT)
+        except asyncio.TimeoutError:
+            await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Send timed out, resync")
+            return
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/ws/projects/{project_id}")
+async def project_events_ws(websocket: WebSocket, project_id: str):
+    """Stream a project's task.created / task.updated / task.deleted events.
+
+    Each message is one JSON event. Subscribers that fall more than
+    REALTIME_QUEUE_SIZE events behind are closed with code 1013; a
+    {"type": "resync"} event means events may have been lost. Either way,
+    clients catch up with GET /tasks/changes.
+    """
+    # Subscribe before accepting so no event after the handshake is missed
+    subscription = broker.subscribe(project_id)
+    try:
+        await websocket.accept()
+    except BaseException:
+        broker.unsubscribe(subscription)
+        raise
+    tasks = [
+        asyncio.create_task(_forward_events(websocket, subscription)),
+        asyncio.create_task(_wait_for_disconnect(websocket)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+        broker.unsubscribe(subscription)
+
+
+async def _event_stream(project_id: str):
+    subscription = broker.subscribe(project_id)
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.get(), REALTIME_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if message is None:
+                yield "event: dropped\ndata: {}\n\n"
+                return
+            yield f"data: {message}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("/sse/projects/{project_id}")
+async def project_events_sse(project_id: str):
+    """Server-sent events fallback for /ws/projects/{project_id}.
+
+    Same events as the WebSocket; a dropped subscriber receives a final
+    "dropped" event before the stream ends.
+    """
+    return StreamingResponse(
+        _event_stream(project_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,43 +1,374 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from enum import Enum
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, insert, literal, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from uuid import uuid4
 
-from app.models import Task, Project, User
+from app.models import Task, TaskTombstone, Project, User
 from app.database import get_db
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
-from app.dependencies.auth import get_current_user
+from app.schemas.task import (
+    TaskBulkCreate,
+    TaskBulkResponse,
+    TaskBulkResult,
+    TaskBulkUpdate,
+    TaskChangesResponse,
+    TaskCreate,
+    TaskResponse,
+    TaskTombstoneResponse,
+    TaskUpdate,
+)
+from app.schemas.fields import rows_response
+from app.dependencies.auth import AuthenticatedUser, get_current_user
+from app.dependencies.fields import sparse_fields
+from app.utils.conditional import (
+    cached_not_modified,
+    collection_etag,
+    if_match_versions,
+    not_modified,
+    resource_etag,
+    validator_headers,
+)
+from app.utils.db_errors import violated_constraint
+from app.utils.delta_sync import CHANGES_ORDER, merge_changes, sync_window
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+)
+from app.utils.query_budget import query_budget
+from app.utils.realtime import stage_events, task_deleted_event, task_event
+from app.utils.response_cache import project_scope, response_cache, task_scope
 
 router = APIRouter()
 
 
+class TaskOrder(str, Enum):
+    """Sort orders supported by task list pagination."""
+    CREATED = "created"
+    POSITION = "position"
+
+
+# Task foreign keys whose violation means a referenced row does not exist
+TASK_FOREIGN_KEY_ERRORS = {
+    "Task_projectId_fkey": "Project not found",
+    "Task_assigneeId_fkey": "Assignee not found",
+}
+# A stateless token can outlive its user; the insert then fails on the creator
+TASK_CREATOR_FOREIGN_KEY = "Task_creatorId_fkey"
+
+# Sort column for each order; the task id breaks ties
+TASK_ORDER_COLUMNS = {
+    TaskOrder.CREATED: Task.createdAt,
+    TaskOrder.POSITION: Task.position,
+}
+
+TASK_RESPONSE_FIELDS = tuple(TaskResponse.model_fields)
+
+
 @router.get("/", response_model=list[TaskResponse])
-def list_tasks(
+@query_budget(2)
+async def list_tasks(
+    request: Request,
+    response: Response,
     project_id: str | None = None,
-    status: str | None = None,
+    task_status: str | None = Query(default=None, alias="status"),
     assignee_id: str | None = None,
-    db: Session = Depends(get_db),
+    order: TaskOrder = TaskOrder.CREATED,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = Depends(sparse_fields(TaskResponse)),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Get all tasks, optionally filtered by project, status, or assignee."""
-    query = db.query(Task)
+    """Get tasks, optionally filtered by project, status, or assignee.
+
+    Results are paginated by keyset on (createdAt, id) or (position, id).
+    When more results exist, the cursor for the next page is returned in
+    the X-Next-Cursor response header. With ?fields=, only the listed
+    columns are selected and serialized. Listings of a single project are
+    served from the response cache until a write to that project.
+
+    The ETag comes from count(*) and max(updatedAt) over the filter, so a
+    matching If-None-Match gets a 304 before any task row is loaded. No
+    Last-Modified is sent: max(updatedAt) alone misses tasks leaving the
+    filter (deleted, or moved to another status or assignee).
+    """
+    params = [
+        ("project_id", project_id), ("status", task_status), ("assignee_id", assignee_id),
+        ("order", order.value), ("limit", limit), ("cursor", cursor), ("fields", fields),
+    ]
+    cache_key = None
+    if project_id:
+        cache_key, cached = await response_cache.lookup("list_tasks", [project_scope(project_id)], params)
+        if cached is not None:
+            return cached_not_modified(request.headers, cached) or cached
+
+    sort_column = TASK_ORDER_COLUMNS[order]
+    after = None
+    if cursor:
+        after = decode_cursor(cursor, order.value, sort_column.type.python_type)
+        if after is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
 
+    conditions = []
     if project_id:
-        query = query.filter(Task.projectId == project_id)
+        conditions.append(Task.projectId == project_id)
 
-    if status:
-        query = query.filter(Task.status == status)
+    if task_status:
+        conditions.append(Task.status == task_status)
 
     if assignee_id:
-        query = query.filter(Task.assigneeId == assignee_id)
+        conditions.append(Task.assigneeId == assignee_id)
+
+    count, last_modified = (await db.execute(
+        select(func.count(), func.max(Task.updatedAt)).where(*conditions)
+    )).one()
+    etag = collection_etag(count, last_modified, params)
+    unchanged = not_modified(request.headers, etag)
+    if unchanged is not None:
+        return unchanged
+    response.headers.update(validator_headers(etag, None))
+
+    # Plain column rows rather than ORM objects, serialized without
+    # per-row validation; the sort key is appended if not requested
+    names = fields or TASK_RESPONSE_FIELDS
+    columns = [getattr(Task, name) for name in names]
+    if sort_column.key not in names:
+        columns.append(sort_column)
+    query = keyset_page(select(*columns).where(*conditions), sort_column, Task.id, after, limit)
+    rows = (await db.execute(query)).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            order.value, getattr(last, sort_column.key), last.id
+        )
+
+    return await response_cache.store(cache_key, rows_response(TaskResponse, names, rows, response))
+
 
-    tasks = query.all()
-    return [TaskResponse.model_validate(task) for task in tasks]
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def create_tasks_bulk(
+    bulk_data: TaskBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Create many tasks in one transaction. Requires authentication.
+
+    Project and assignee references are checked with a single query; items
+    referencing missing rows are reported as failed and the rest are
+    inserted with multi-row INSERT ... RETURNING statements of up to 1000
+    rows each (SQLAlchemy's insertmanyvalues batching), so like
+    PATCH /tasks/bulk the route has no fixed query budget.
+    """
+    items = bulk_data.tasks
+    project_ids = {item.projectId for item in items}
+    assignee_ids = {item.assigneeId for item in items if item.assigneeId}
+
+    references = union_all(
+        select(literal("project").label("kind"), Project.id.label("id")).where(Project.id.in_(project_ids)),
+        select(literal("user").label("kind"), User.id.label("id")).where(User.id.in_(assignee_ids)),
+    )
+    found = {(kind, ref_id) for kind, ref_id in (await db.execute(references)).all()}
+
+    results: list[TaskBulkResult | None] = [None] * len(items)
+    rows = []
+    row_indexes = []
+    now = datetime.utcnow()
+    for index, item in enumerate(items):
+        if ("project", item.projectId) not in found:
+            results[index] = TaskBulkResult(index=index, ok=False, error="Project not found")
+            continue
+        if item.assigneeId and ("user", item.assigneeId) not in found:
+            results[index] = TaskBulkResult(index=index, ok=False, error="Assignee not found")
+            continue
+        rows.append({
+            "id": str(uuid4()),
+            "title": item.title,
+            "description": item.description,
+            "projectId": item.projectId,
+            "creatorId": current_user.id,
+            "assigneeId": item.assigneeId,
+            "status": item.status.value,
+            "priority": item.priority.value,
+            "dueDate": item.dueDate,
+            "position": 0,
+            "createdAt": now,
+            "updatedAt": now,
+        })
+        row_indexes.append(index)
+
+    if rows:
+        try:
+            created = (await db.scalars(
+                insert(Task).returning(Task, sort_by_parameter_order=True), rows
+            )).all()
+        except IntegrityError as e:
+            await db.rollback()
+            if violated_constraint(e) == TASK_CREATOR_FOREIGN_KEY:
+                raise _creator_not_found()
+            raise
+        # Serialize before commit so expired attributes are never reloaded
+        for index, task in zip(row_indexes, created):
+            results[index] = TaskBulkResult(index=index, ok=True, task=TaskResponse.model_validate(task))
+        stage_events(db, [task_event("task.created", results[index].task) for index in row_indexes])
+        await db.commit()
+        await response_cache.invalidate(*(project_scope(row["projectId"]) for row in rows))
+
+    return TaskBulkResponse(succeeded=len(rows), failed=len(items) - len(rows), results=results)
+
+
+@router.patch("/bulk", response_model=TaskBulkResponse)
+async def update_tasks_bulk(
+    bulk_data: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Update many tasks in one transaction. Requires authentication.
+
+    Tasks sharing an identical patch are updated with a single
+    UPDATE ... WHERE id IN (...) RETURNING, so moving a whole sprint to
+    DONE is one statement. Missing tasks, missing assignees and repeated
+    ids are reported per item.
+    """
+    shared_values = bulk_data.patch.model_dump(exclude_none=True) if bulk_data.patch else {}
+    targets = [(task_id, shared_values) for task_id in bulk_data.ids]
+    targets += [
+        (item.id, item.model_dump(exclude={"id"}, exclude_none=True))
+        for item in bulk_data.updates
+    ]
+
+    assignee_ids = {values["assigneeId"] for _, values in targets if "assigneeId" in values}
+    existing_assignees = set()
+    if assignee_ids:
+        existing_assignees = set(await db.scalars(select(User.id).where(User.id.in_(assignee_ids))))
+
+    results: list[TaskBulkResult | None] = [None] * len(targets)
+    groups: dict[tuple, list[tuple[int, str]]] = {}
+    seen_ids = set()
+    for index, (task_id, values) in enumerate(targets):
+        if task_id in seen_ids:
+            results[index] = TaskBulkResult(index=index, ok=False, error="Duplicate task id")
+            continue
+        seen_ids.add(task_id)
+        if "assigneeId" in values and values["assigneeId"] not in existing_assignees:
+            results[index] = TaskBulkResult(index=index, ok=False, error="Assignee not found")
+            continue
+        groups.setdefault(tuple(sorted(values.items())), []).append((index, task_id))
+
+    now = datetime.utcnow()
+    changed_scopes = []
+    for values, members in groups.items():
+        statement = (
+            update(Task)
+            .where(Task.id.in_([task_id for _, task_id in members]))
+            .values(**dict(values), updatedAt=now)
+            .returning(Task)
+        )
+        updated = {task.id: task for task in (await db.scalars(statement)).all()}
+        for task in updated.values():
+            changed_scopes += [task_scope(task.id), project_scope(task.projectId)]
+        for index, task_id in members:
+            task = updated.get(task_id)
+            if task is None:
+                results[index] = TaskBulkResult(index=index, ok=False, error="Task not found")
+            else:
+                results[index] = TaskBulkResult(index=index, ok=True, task=TaskResponse.model_validate(task))
+
+    stage_events(db, [task_event("task.updated", result.task) for result in results if result.ok])
+    await db.commit()
+    await response_cache.invalidate(*changed_scopes)
+
+    succeeded = sum(1 for result in results if result.ok)
+    return TaskBulkResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+@router.get("/changes", response_model=TaskChangesResponse)
+@query_budget(2)
+async def list_task_changes(
+    project_id: str,
+    since: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a project's tasks created, updated or deleted since a sync cursor.
+
+    Without `since`, returns every task (an initial sync). Changes are
+    read by keyset on (updatedAt, id) from Task and (deletedAt, id) from
+    TaskTombstone, both through (projectId, time, id) indexes, so a poll
+    costs in proportion to the changes rather than the board. Changes from
+    the last DELTA_SYNC_SETTLE_MS are held back until they can no longer
+    be overtaken by a transaction committing late.
+    """
+    oldest, newest = sync_window()
+    after = None
+    if since:
+        after = decode_cursor(since, CHANGES_ORDER, datetime)
+        if after is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        # Caught-up polls advance the cursor to the sync watermark, so only a
+        # client away for longer than the retention window lands here, when
+        # tombstones after its cursor may already have been pruned
+        if after[0] < oldest:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Cursor expired, sync again without since"
+            )
+
+    task_query = keyset_page(
+        select(Task).where(Task.projectId == project_id, Task.updatedAt <= newest),
+        Task.updatedAt, Task.id, after, limit,
+    )
+    tasks = (await db.scalars(task_query)).all()
+    tombstones = []
+    if after is not None:
+        tombstone_query = keyset_page(
+            select(TaskTombstone).where(
+                TaskTombstone.projectId == project_id, TaskTombstone.deletedAt <= newest
+            ),
+            TaskTombstone.deletedAt, TaskTombstone.id, after, limit,
+        )
+        tombstones = (await db.scalars(tombstone_query)).all()
+
+    tasks, tombstones, last, has_more = merge_changes(tasks, tombstones, limit)
+    if not has_more:
+        # Caught up: move the cursor to the settled watermark even if nothing
+        # changed, so an idle board's cursor never ages out of retention. It
+        # never moves back, in case this server's clock lags the last one's.
+        last = max(change for change in (after, last, (newest, "")) if change is not None)
+    return TaskChangesResponse(
+        tasks=[TaskResponse.model_validate(task) for task in tasks],
+        deleted=[TaskTombstoneResponse.model_validate(tombstone) for tombstone in tombstones],
+        cursor=encode_cursor(CHANGES_ORDER, *last),
+        hasMore=has_more,
+    )
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(task_id: str, db: Session = Depends(get_db)):
-    """Get a specific task by ID."""
-    task = db.query(Task).filter(Task.id == task_id).first()
+@query_budget(1)
+async def get_task(
+    task_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a specific task by ID, with ETag and Last-Modified validators."""
+    cache_key, cached = await response_cache.lookup("get_task", [task_scope(task_id)], [])
+    if cached is not None:
+        return cached_not_modified(request.headers, cached) or cached
+
+    task = await db.scalar(select(Task).where(Task.id == task_id))
 
     if not task:
         raise HTTPException(
@@ -45,36 +376,66 @@ def get_task(task_id: str, db: Session = Depends(get_db)):
             detail="Task not found"
         )
 
-    return TaskResponse.model_validate(task)
+    etag = resource_etag(task.updatedAt)
+    unchanged = not_modified(request.headers, etag, task.updatedAt)
+    if unchanged is not None:
+        return unchanged
+
+    headers = validator_headers(etag, task.updatedAt)
+    if cache_key is None:
+        response.headers.update(headers)
+        return TaskResponse.model_validate(task)
+    rendered = Response(
+        TaskResponse.model_validate(task).model_dump_json(), media_type="application/json", headers=headers
+    )
+    return await response_cache.store(cache_key, rendered)
+
+
+def _creator_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="User not found",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def _missing_reference_detail(
+    db: AsyncSession,
+    error: IntegrityError,
+    project_id: str | None,
+) -> str:
+    """Map a foreign key violation on Task to the 404 detail for the missing row.
+
+    A missing creator means the caller's user was deleted and raises 401.
+    """
+    constraint = violated_constraint(error)
+    if constraint in TASK_FOREIGN_KEY_ERRORS:
+        return TASK_FOREIGN_KEY_ERRORS[constraint]
+    if constraint == TASK_CREATOR_FOREIGN_KEY:
+        raise _creator_not_found()
+    if constraint is not None:
+        raise error
+    # The driver did not name the constraint; only this error path pays for a lookup
+    if project_id and await db.scalar(select(Project.id).where(Project.id == project_id)) is None:
+        return "Project not found"
+    return "Assignee not found"
 
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(
+@query_budget(4)
+async def create_task(
     task_data: TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
-    """Create a new task. Requires authentication."""
-    # Verify project exists and user has access
-    project = db.query(Project).filter(Project.id == task_data.projectId).first()
-
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-
-    # Verify assignee exists if provided
-    if task_data.assigneeId:
-        assignee = db.query(User).filter(User.id == task_data.assigneeId).first()
-        if not assignee:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Assignee not found"
-            )
+    """Create a new task. Requires authentication.
 
+    A single INSERT ... RETURNING; missing projects and assignees are
+    detected through the Task foreign keys instead of separate lookups.
+    """
     now = datetime.utcnow()
-    new_task = Task(
+    statement = insert(Task).values(
         id=str(uuid4()),
         title=task_data.title,
         description=task_data.description,
@@ -87,70 +448,96 @@ def create_task(
         position=0,
         createdAt=now,
         updatedAt=now,
-    )
+    ).returning(Task)
 
-    db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    try:
+        new_task = await db.scalar(statement)
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=await _missing_reference_detail(db, e, task_data.projectId)
+        )
+
+    # Serialize before commit so expired attributes are never reloaded
+    created = TaskResponse.model_validate(new_task)
+    stage_events(db, [task_event("task.created", created)])
+    await db.commit()
+    await response_cache.invalidate(project_scope(created.projectId))
 
-    return TaskResponse.model_validate(new_task)
+    response.headers.update(validator_headers(resource_etag(created.updatedAt), created.updatedAt))
+    return created
 
 
 @router.patch("/{task_id}", response_model=TaskResponse)
-def update_task(
+@query_budget(4)
+async def update_task(
     task_id: str,
     task_data: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
-    """Update a task. Requires authentication."""
-    task = db.query(Task).filter(Task.id == task_id).first()
-
-    if not task:
+    """Update a task. Requires authentication.
+
+    A single UPDATE ... RETURNING; an unknown assignee is detected through
+    the Task_assigneeId_fkey foreign key. With If-Match, the ETag's version
+    is part of the UPDATE's WHERE clause, so a concurrent change makes the
+    request fail with 412 instead of being overwritten.
+    """
+    values = task_data.model_dump(exclude_none=True)
+    statement = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(**values, updatedAt=datetime.utcnow())
+        .returning(Task)
+    )
+    if_match = request.headers.get("if-match")
+    if if_match is not None:
+        versions = if_match_versions(if_match)
+        if versions is not None:
+            statement = statement.where(Task.updatedAt.in_(versions))
+
+    try:
+        task = await db.scalar(statement)
+    except IntegrityError as e:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
+            detail=await _missing_reference_detail(db, e, None)
         )
 
-    # Verify assignee exists if provided
-    if task_data.assigneeId:
-        assignee = db.query(User).filter(User.id == task_data.assigneeId).first()
-        if not assignee:
+    if not task:
+        # Only a failed precondition pays for telling 412 from 404
+        if if_match is not None and await db.scalar(select(Task.id).where(Task.id == task_id)) is not None:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Assignee not found"
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Task has been modified"
             )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
 
-    # Update fields
-    if task_data.title is not None:
-        task.title = task_data.title
-    if task_data.description is not None:
-        task.description = task_data.description
-    if task_data.status is not None:
-        task.status = task_data.status
-    if task_data.priority is not None:
-        task.priority = task_data.priority
-    if task_data.assigneeId is not None:
-        task.assigneeId = task_data.assigneeId
-    if task_data.dueDate is not None:
-        task.dueDate = task_data.dueDate
-
-    task.updatedAt = datetime.utcnow()
-
-    db.commit()
-    db.refresh(task)
+    updated = TaskResponse.model_validate(task)
+    stage_events(db, [task_event("task.updated", updated)])
+    await db.commit()
+    await response_cache.invalidate(task_scope(task_id), project_scope(updated.projectId))
 
-    return TaskResponse.model_validate(task)
+    response.headers.update(validator_headers(resource_etag(updated.updatedAt), updated.updatedAt))
+    return updated
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+@query_budget(7)
+async def delete_task(
     task_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
-    """Delete a task. Requires authentication."""
-    task = db.query(Task).filter(Task.id == task_id).first()
+    """Delete a task, leaving a tombstone for delta sync. Requires authentication."""
+    task = await db.scalar(select(Task).where(Task.id == task_id))
 
     if not task:
         raise HTTPException(
@@ -158,7 +545,12 @@ def delete_task(
             detail="Task not found"
         )
 
-    db.delete(task)
-    db.commit()
+    project_id = task.projectId
+    await db.delete(task)
+    # Lets delta sync clients (GET /tasks/changes) drop the task
+    db.add(TaskTombstone(id=task_id, projectId=project_id, deletedAt=datetime.utcnow()))
+    stage_events(db, [task_deleted_event(task_id, project_id)])
+    await db.commit()
+    await response_cache.invalidate(task_scope(task_id), project_scope(project_id))
 
     return None
@@ -1,13 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from datetime import datetime, timezone
 import uuid
 from app.models import User
 from app.database import get_db
 from app.schemas.user import UserResponse, UserCreateRequest
 from app.schemas.auth import LoginRequest, TokenResponse
-from app.utils.security import hash_password, verify_password
-from app.utils.jwt import create_access_token
+from app.schemas.fields import sparse_response
+from app.dependencies.auth import AuthenticatedUser, get_current_user, invalidate_user
+from app.dependencies.fields import sparse_fields
+from app.utils.security import (
+    PasswordHasherBusy,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
+from app.utils.jwt import create_access_token, stateless_tokens_enabled
+from app.utils.revocation import token_versions
+from app.utils.query_budget import query_budget
 
 router = APIRouter()
 
@@ -25,20 +37,31 @@ def _user_to_response(user: User) -> UserResponse:
 
 
 @router.get("/")
-def read_users(db: Session = Depends(get_db)):
-    users = db.query(User).all()
+@query_budget(1)
+async def read_users(
+    response: Response,
+    fields: tuple[str, ...] | None = Depends(sparse_fields(UserResponse)),
+    db: AsyncSession = Depends(get_db),
+):
+    query = select(User)
+    if fields:
+        query = query.options(load_only(*(getattr(User, name) for name in fields)))
+    users = (await db.scalars(query)).all()
+    if fields:
+        return sparse_response(UserResponse, fields, users, response)
     return [_user_to_response(user) for user in users]
 
 @router.post("/", response_model=UserResponse)
-def create_user(user: UserCreateRequest, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == user.email).first()
+@query_budget(3)
+async def create_user(user: UserCreateRequest, db: AsyncSession = Depends(get_db)):
+    existing_user = await db.scalar(select(User).where(User.email == user.email))
     if existing_user:
         raise HTTPException(
             status_code=409,
             detail="User with this email already exists."
         )
 
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password_async(user.password)
     now = datetime.now(timezone.utc)
     db_user = User(
         id=str(uuid.uuid4()),
@@ -50,21 +73,62 @@ def create_user(user: UserCreateRequest, db: Session = Depends(get_db)):
         updatedAt=now,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return _user_to_response(db_user)
 
 
 @router.post("/login", response_model=TokenResponse, status_code=status.HTTP_200_OK)
-def login(credentials: LoginRequest, db: Session = Depends(get_db)):
+@query_budget(2)
+async def login(credentials: LoginRequest, db: AsyncSession = Depends(get_db)):
     """Authenticate user and return JWT token."""
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await db.scalar(select(User).where(User.email == credentials.email))
 
-    if not user or not verify_password(credentials.password, user.password):
+    if not user or not await verify_password_async(credentials.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
-    access_token = create_access_token(user.id)
-    return TokenResponse(access_token=access_token, token_type="bearer")
\ No newline at end of file
+    # Build the token before the rehash commit so expired attributes are never reloaded
+    claims = {"ver": user.tokenVersion}
+    if stateless_tokens_enabled():
+        claims.update(email=user.email, given_name=user.firstName, family_name=user.lastName)
+    access_token = create_access_token(user.id, claims)
+
+    # Bring the stored hash to the current work factor while the plaintext is at hand
+    if needs_rehash(user.password):
+        try:
+            new_hash = await hash_password_async(credentials.password)
+        except PasswordHasherBusy:
+            # Rehashing is opportunistic; a later login will retry
+            new_hash = None
+        if new_hash is not None:
+            await db.execute(
+                update(User)
+                .where(User.id == user.id, User.password == user.password)
+                .values(password=new_hash)
+            )
+            await db.commit()
+
+    return TokenResponse(access_token=access_token, token_type="bearer")
+
+
+@router.post("/me/revoke-tokens", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(2)
+async def revoke_tokens(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Invalidate every access token issued to the current user so far."""
+    version = await db.scalar(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(tokenVersion=User.tokenVersion + 1, updatedAt=datetime.now(timezone.utc))
+        .returning(User.tokenVersion)
+    )
+    await db.commit()
+    # Other workers pick the new version up on their next refresh
+    token_versions.bump(current_user.id, version)
+    invalidate_user(current_user.id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,71 @@
+from enum import Enum
+from functools import lru_cache, reduce
+from operator import or_
+from types import UnionType
+from typing import Union, get_args, get_origin
+
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from typing_extensions import TypedDict
+
+
+@lru_cache(maxsize=256)
+def trimmed_model(schema: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """Build (once per field set) a copy of a response schema limited to the given fields."""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+
+
+@lru_cache(maxsize=256)
+def _list_adapter(schema: type[BaseModel], fields: tuple[str, ...]) -> TypeAdapter:
+    return TypeAdapter(list[trimmed_model(schema, fields)])
+
+
+def sparse_response(schema: type[BaseModel], fields: tuple[str, ...], objects, response: Response) -> Response:
+    """Serialize ORM objects with only the requested fields.
+
+    Headers already set on the injected response (e.g. X-Next-Cursor) are
+    carried over, since FastAPI does not merge them into a returned Response.
+    """
+    adapter = _list_adapter(schema, fields)
+    content = adapter.dump_json(adapter.validate_python(list(objects), from_attributes=True))
+    return _json_response(content, response)
+
+
+def _row_annotation(annotation):
+    """Type of a column value as a Core row returns it (enum columns yield plain strings)."""
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return str
+    if get_origin(annotation) in (Union, UnionType):
+        return reduce(or_, (_row_annotation(arg) for arg in get_args(annotation)))
+    return annotation
+
+
+@lru_cache(maxsize=256)
+def _row_adapter(schema: type[BaseModel], fields: tuple[str, ...]) -> TypeAdapter:
+    row_type = TypedDict(
+        f"{schema.__name__}Row",
+        {name: _row_annotation(schema.model_fields[name].annotation) for name in fields},
+    )
+    return TypeAdapter(list[row_type])
+
+
+def rows_response(schema: type[BaseModel], fields: tuple[str, ...], rows, response: Response) -> Response:
+    """Serialize Core rows straight to JSON bytes with the given fields.
+
+    Unlike sparse_response, nothing is validated or instantiated per row:
+    pydantic-core encodes the row dicts against a schema built once per
+    field set. Rows must select the fields in this order (extra trailing
+    columns, such as a sort key, are left out) from columns that already
+    satisfy the schema's types.
+    """
+    content = _row_adapter(schema, fields).dump_json([row._asdict() for row in rows])
+    return _json_response(content, response)
+
+
+def _json_response(content: bytes, response: Response) -> Response:
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return Response(content=content, media_type="application/json", headers=headers)
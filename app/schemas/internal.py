@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+
+class ProfilingArmRequest(BaseModel):
+    route: str
+    requests: int = Field(default=1, ge=0, le=100)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class TaskStatus(str, Enum):
@@ -56,3 +56,73 @@ class TaskResponse(BaseModel):
     dueDate: datetime | None
     createdAt: datetime
     updatedAt: datetime
+
+
+class TaskTombstoneResponse(BaseModel):
+    """Schema for a deleted task in a delta sync response."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    deletedAt: datetime
+
+
+class TaskChangesResponse(BaseModel):
+    """Schema for a page of task changes since a sync cursor.
+
+    Clients upsert `tasks`, remove `deleted`, store `cursor` and pass it
+    back as `since`; `hasMore` means the next page can be fetched at once.
+    """
+    tasks: list[TaskResponse]
+    deleted: list[TaskTombstoneResponse]
+    cursor: str
+    hasMore: bool
+
+
+# Upper bound on items accepted by one bulk request
+MAX_BULK_TASKS = 5000
+
+
+class TaskBulkCreate(BaseModel):
+    """Schema for creating many tasks in one request."""
+    tasks: list[TaskCreate] = Field(min_length=1, max_length=MAX_BULK_TASKS)
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    """Schema for one per-task patch in a bulk update."""
+    id: str
+
+
+class TaskBulkUpdate(BaseModel):
+    """Schema for updating many tasks in one request.
+
+    Either apply one patch to every task in ids, list per-task patches in
+    updates, or both. Results are indexed over ids followed by updates.
+    """
+    ids: list[str] = Field(default_factory=list, max_length=MAX_BULK_TASKS)
+    patch: TaskUpdate | None = None
+    updates: list[TaskBulkUpdateItem] = Field(default_factory=list, max_length=MAX_BULK_TASKS)
+
+    @model_validator(mode="after")
+    def check_targets(self):
+        if self.ids and self.patch is None:
+            raise ValueError("patch is required when ids are given")
+        if not self.ids and not self.updates:
+            raise ValueError("either ids or updates must be non-empty")
+        if len(self.ids) + len(self.updates) > MAX_BULK_TASKS:
+            raise ValueError(f"at most {MAX_BULK_TASKS} tasks per request")
+        return self
+
+
+class TaskBulkResult(BaseModel):
+    """Outcome for one item of a bulk request, by position in the request."""
+    index: int
+    ok: bool
+    task: TaskResponse | None = None
+    error: str | None = None
+
+
+class TaskBulkResponse(BaseModel):
+    """Schema for bulk task responses."""
+    succeeded: int
+    failed: int
+    results: list[TaskBulkResult]
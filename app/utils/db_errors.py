@@ -0,0 +1,10 @@
+from sqlalchemy.exc import IntegrityError
+
+
+def violated_constraint(error: IntegrityError) -> str | None:
+    """Return the name of the constraint behind an IntegrityError, if the driver reports it.
+
+    psycopg2 and psycopg 3 both expose it as diag.constraint_name.
+    """
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None)
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+
+from app.database import session_scope
+from app.models import TaskTombstone
+
+logger = logging.getLogger(__name__)
+
+# Changes newer than this are held back from GET /tasks/changes. updatedAt is
+# set before commit, so a slow transaction (or an app server with a lagging
+# clock) can commit a row stamped earlier than one already returned; the
+# window must exceed both for the cursor to never skip a change.
+DELTA_SYNC_SETTLE = timedelta(milliseconds=int(os.getenv("DELTA_SYNC_SETTLE_MS", "2000")))
+# Tombstones are pruned after this long; older cursors get 410 and must resync
+DELTA_SYNC_RETENTION = timedelta(days=int(os.getenv("DELTA_SYNC_RETENTION_DAYS", "30")))
+DELTA_SYNC_PRUNE_INTERVAL = int(os.getenv("DELTA_SYNC_PRUNE_INTERVAL", "3600"))
+
+# Cursor ordering name for change feeds
+CHANGES_ORDER = "changes"
+
+
+def sync_window(now: datetime | None = None) -> tuple[datetime, datetime]:
+    """Return (oldest usable cursor time, newest change time served now)."""
+    now = now or datetime.utcnow()
+    return now - DELTA_SYNC_RETENTION, now - DELTA_SYNC_SETTLE
+
+
+def merge_changes(tasks, tombstones, limit: int) -> tuple[list, list, tuple | None, bool]:
+    """Merge two (time, id)-ordered pages into one page of at most `limit` changes.
+
+    Each input holds up to limit + 1 rows. Returns the tasks and tombstones
+    in the page, the (time, id) of its last change and whether more follow.
+    """
+    changes = sorted(
+        [(task.updatedAt, task.id, task) for task in tasks]
+        + [(tombstone.deletedAt, tombstone.id, tombstone) for tombstone in tombstones],
+        key=lambda change: change[:2],
+    )
+    page = changes[:limit]
+    page_tasks = [change[2] for change in page if not isinstance(change[2], TaskTombstone)]
+    page_tombstones = [change[2] for change in page if isinstance(change[2], TaskTombstone)]
+    last = page[-1][:2] if page else None
+    return page_tasks, page_tombstones, last, len(changes) > limit
+
+
+async def prune_tombstones() -> int:
+    """Delete tombstones older than the retention window; returns the number removed."""
+    oldest, _ = sync_window()
+    async with session_scope() as db:
+        result = await db.execute(delete(TaskTombstone).where(TaskTombstone.deletedAt < oldest))
+        await db.commit()
+    return result.rowcount
+
+
+async def run_tombstone_pruning():
+    """Background task: keep the tombstone table bounded by the retention window."""
+    while True:
+        try:
+            pruned = await prune_tombstones()
+            if pruned:
+                logger.info(f"Pruned {pruned} task tombstones")
+        except Exception:
+            logger.exception("Failed to prune task tombstones")
+        await asyncio.sleep(DELTA_SYNC_PRUNE_INTERVAL)
@@ -2,32 +2,56 @@ import os
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from dotenv import load_dotenv
+from app.utils.keyring import load_keyring
 
 load_dotenv()
 
-SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+# Keys are parsed once here rather than on every encode/decode
+keyring = load_keyring()
 ACCESS_TOKEN_EXPIRE_DAYS = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_DAYS", "7"))
+# "reference": tokens carry only the user id and version, resolved against the
+# database; "stateless": tokens also carry the user's profile claims so
+# requests are authenticated without a database lookup.
+TOKEN_MODE = os.getenv("JWT_TOKEN_MODE", "reference").lower()
 
 
-def create_access_token(user_id: str) -> str:
-    """Create a JWT access token with expiration."""
+def stateless_tokens_enabled() -> bool:
+    return TOKEN_MODE == "stateless"
+
+
+def create_access_token(user_id: str, claims: dict | None = None) -> str:
+    """Create a JWT access token with expiration and optional extra claims."""
     expire = datetime.utcnow() + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
     to_encode = {
+        **(claims or {}),
         "sub": user_id,
         "exp": expire,
     }
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    key = keyring.active
+    if key is None:
+        raise JWTError("No JWT signing key configured")
+    headers = {"kid": key.kid} if key.kid is not None else None
+    encoded_jwt = jwt.encode(to_encode, key.signer, algorithm=key.algorithm, headers=headers)
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> str | None:
-    """Decode and validate JWT token, returning user_id or None if invalid."""
+def decode_access_token_payload(token: str) -> dict | None:
+    """Decode and validate JWT token, returning its claims or None if invalid."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        key = keyring.verification_key(jwt.get_unverified_header(token).get("kid"))
+        if key is None:
             return None
-        return user_id
+        payload = jwt.decode(token, key.verifier, algorithms=[key.algorithm])
     except JWTError:
         return None
+    if payload.get("sub") is None:
+        return None
+    return payload
+
+
+def decode_access_token(token: str) -> str | None:
+    """Decode and validate JWT token, returning user_id or None if invalid."""
+    payload = decode_access_token_payload(token)
+    if payload is None:
+        return None
+    return payload["sub"]
@@ -0,0 +1,139 @@
+import json
+import os
+from dataclasses import dataclass
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed448 import Ed448PrivateKey, Ed448PublicKey
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+
+EDDSA = "EdDSA"
+_EDDSA_KEY_TYPES = (Ed25519PrivateKey, Ed25519PublicKey, Ed448PrivateKey, Ed448PublicKey)
+
+
+class EdDSAKey(Key):
+    """Ed25519/Ed448 key for python-jose, which has no EdDSA support of its own."""
+
+    def __init__(self, key, algorithm):
+        if algorithm != EDDSA:
+            raise JWKError(f"Invalid algorithm for EdDSA key: {algorithm}")
+        if isinstance(key, str):
+            key = key.encode()
+        if isinstance(key, bytes):
+            try:
+                key = serialization.load_pem_private_key(key, password=None)
+            except ValueError:
+                try:
+                    key = serialization.load_pem_public_key(key)
+                except ValueError as e:
+                    raise JWKError(f"Invalid EdDSA key: {e}")
+        if not isinstance(key, _EDDSA_KEY_TYPES):
+            raise JWKError("Expecting an Ed25519 or Ed448 key")
+        self._algorithm = algorithm
+        self.prepared_key = key
+
+    def is_public(self):
+        return isinstance(self.prepared_key, (Ed25519PublicKey, Ed448PublicKey))
+
+    def sign(self, msg):
+        if self.is_public():
+            raise JWKError("Cannot sign with a public key")
+        return self.prepared_key.sign(msg)
+
+    def verify(self, msg, sig):
+        key = self.prepared_key if self.is_public() else self.prepared_key.public_key()
+        try:
+            key.verify(sig, msg)
+        except InvalidSignature:
+            return False
+        return True
+
+    def public_key(self):
+        if self.is_public():
+            return self
+        return type(self)(self.prepared_key.public_key(), self._algorithm)
+
+
+jwk.register_key(EDDSA, EdDSAKey)
+
+
+@dataclass(frozen=True, slots=True)
+class KeyEntry:
+    """A parsed key: signer is None for verification-only (public) keys."""
+    kid: str | None
+    algorithm: str
+    verifier: Key
+    signer: Key | None
+
+
+def parse_key(kid: str | None, algorithm: str, material: str) -> KeyEntry:
+    """Parse key material once into python-jose key objects.
+
+    `material` is the shared secret for HS* algorithms and a PEM private or
+    public key otherwise.
+    """
+    key = jwk.construct(material, algorithm)
+    if algorithm.startswith("HS"):
+        return KeyEntry(kid, algorithm, key, key)
+    if getattr(key, "is_public", lambda: False)():
+        return KeyEntry(kid, algorithm, key, None)
+    return KeyEntry(kid, algorithm, key.public_key(), key)
+
+
+class Keyring:
+    """JWT keys indexed by kid, with one active key used for signing.
+
+    Tokens carry the signing key's kid in their header, so retired keys can
+    stay in the ring (typically as public keys) until the tokens they signed
+    expire. Tokens without a kid are checked against the active key.
+    """
+
+    def __init__(self, entries: list[KeyEntry], active_kid: str | None = None):
+        self._entries = {entry.kid: entry for entry in entries}
+        if entries and active_kid is None:
+            active_kid = entries[0].kid
+        self.active = self._entries.get(active_kid)
+        if entries and (self.active is None or self.active.signer is None):
+            raise ValueError(f"Active JWT key {active_kid!r} is missing or has no private key")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def verification_key(self, kid: str | None) -> KeyEntry | None:
+        if kid is None:
+            return self.active
+        if not isinstance(kid, str):
+            return None
+        return self._entries.get(kid)
+
+    @classmethod
+    def from_file(cls, path: str) -> "Keyring":
+        """Load a keyring from a JSON file of the form
+
+            {"active": "<kid>", "keys": [{"kid": ..., "alg": ..., "key": ... | "key_file": ...}]}
+        """
+        with open(path) as f:
+            config = json.load(f)
+        entries = []
+        for item in config["keys"]:
+            material = item.get("key")
+            if material is None:
+                with open(item["key_file"]) as key_file:
+                    material = key_file.read()
+            entries.append(parse_key(item["kid"], item["alg"], material))
+        return cls(entries, config.get("active"))
+
+
+def load_keyring() -> Keyring:
+    """Build the keyring from JWT_KEYRING_FILE, or the single JWT_SECRET_KEY/JWT_ALGORITHM key."""
+    keyring_file = os.getenv("JWT_KEYRING_FILE")
+    if keyring_file:
+        return Keyring.from_file(keyring_file)
+    secret = os.getenv("JWT_SECRET_KEY")
+    if not secret:
+        return Keyring([])
+    algorithm = os.getenv("JWT_ALGORITHM", "HS256")
+    return Keyring([parse_key(os.getenv("JWT_KEY_ID"), algorithm, secret)])
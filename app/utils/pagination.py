@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(order: str, sort_value, row_id: str) -> str:
+    """Build an opaque cursor pointing just after the given row."""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([order, sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str, sort_type: type) -> tuple | None:
+    """Decode a cursor created for the given ordering, returning (sort_value, id) or None if invalid.
+
+    sort_type is the Python type of the sort column (datetime or int); a
+    cursor whose sort value is not of that type is invalid, so a tampered
+    cursor never reaches the database as a mistyped comparison value.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if cursor_order != order or not isinstance(row_id, str):
+            return None
+        if sort_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif type(sort_value) is not sort_type:
+            # Exact match, so JSON true/false never pass for int
+            return None
+        return sort_value, row_id
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_page(query, sort_column, id_column, after: tuple | None, limit: int):
+    """Order a query by (sort_column, id_column) and restrict it to one page.
+
+    Fetches limit + 1 rows so the caller can tell whether another page exists.
+    """
+    if after is not None:
+        query = query.where(tuple_(sort_column, id_column) > tuple_(*after))
+    return query.order_by(sort_column, id_column).limit(limit + 1)
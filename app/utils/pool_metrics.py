@@ -0,0 +1,111 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.utils.metrics import LATENCY_BUCKETS, Histogram
+
+
+class PoolMetrics:
+    """Counters and checkout wait times for one connection pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_time = Histogram(LATENCY_BUCKETS)
+        self._lock = threading.Lock()
+
+    def _increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def attach(self, pool):
+        """Listen to pool events on the given pool."""
+        self.pool = pool
+        pool._metrics = self
+        event.listen(pool, "connect", lambda *args: self._increment("connects"))
+        event.listen(pool, "checkout", lambda *args: self._increment("checkouts"))
+        event.listen(pool, "checkin", lambda *args: self._increment("checkins"))
+        event.listen(pool, "invalidate", lambda *args: self._increment("invalidations"))
+
+    def snapshot(self) -> dict:
+        """Return live pool occupancy and accumulated counters."""
+        pool = self.pool
+        live = {}
+        if isinstance(pool, QueuePool):
+            live = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                # Negative while the pool has not yet opened pool_size connections
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+            }
+        with self._lock:
+            counters = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+            }
+        return {**live, **counters, "checkout_wait_seconds": self.wait_time.snapshot()}
+
+
+class _TimedPoolMixin:
+    """Record how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        metrics = getattr(self, "_metrics", None)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            if metrics is not None:
+                metrics._increment("timeouts")
+            raise
+        finally:
+            if metrics is not None:
+                metrics.wait_time.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        # Event listeners are carried over by recreate(); only the metrics
+        # back-reference needs moving to the new pool.
+        new_pool = super().recreate()
+        metrics = getattr(self, "_metrics", None)
+        if metrics is not None:
+            new_pool._metrics = metrics
+            metrics.pool = new_pool
+        return new_pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Metrics for every instrumented pool, keyed by name
+POOL_METRICS: dict[str, PoolMetrics] = {}
+
+
+def instrument_pool(name: str, pool) -> PoolMetrics:
+    """Attach metrics to a pool and register them under the given name."""
+    metrics = PoolMetrics(name)
+    metrics.attach(pool)
+    POOL_METRICS[name] = metrics
+    return metrics
+
+
+def get_pool_metrics() -> dict:
+    """Return a snapshot of every instrumented pool."""
+    return {name: metrics.snapshot() for name, metrics in POOL_METRICS.items()}
@@ -0,0 +1,251 @@
+import contextvars
+import cProfile
+import os
+import pstats
+import re
+import secrets
+import threading
+import time
+import types
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+from starlette.concurrency import run_in_threadpool as _run_in_threadpool
+
+# Profiles are written here; profiling is disabled when unset
+PROFILING_DIR = os.getenv("PROFILING_DIR")
+# At most this many profiled requests per minute, and this many at once
+PROFILE_MAX_PER_MINUTE = int(os.getenv("PROFILE_MAX_PER_MINUTE", "6"))
+PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "1"))
+
+# Request header carrying INTERNAL_API_TOKEN to profile that request
+PROFILE_HEADER = "X-Profile"
+PROFILE_FILE_HEADER = "X-Profile-File"
+
+
+class _RequestProfile:
+    """cProfile profiles collected for one request across the threads it used."""
+
+    def __init__(self):
+        self.profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add(self, profile: cProfile.Profile):
+        with self._lock:
+            self.profiles.append(profile)
+
+
+_active_profile: contextvars.ContextVar[_RequestProfile | None] = contextvars.ContextVar(
+    "active_profile", default=None
+)
+
+
+def _profile_call(fn, *args, **kwargs):
+    request_profile = _active_profile.get()
+    if request_profile is None:
+        return fn(*args, **kwargs)
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Another profiler is active (on 3.12+ a profiler observes every thread)
+        return fn(*args, **kwargs)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profile.disable()
+        request_profile.add(profile)
+
+
+async def run_in_threadpool(fn, *args, **kwargs):
+    """starlette's run_in_threadpool, profiling the call when its request is being profiled."""
+    if _active_profile.get() is None:
+        return await _run_in_threadpool(fn, *args, **kwargs)
+    return await _run_in_threadpool(_profile_call, fn, *args, **kwargs)
+
+
+class _TaskProfile:
+    """A cProfile profile enabled only while one coroutine is running.
+
+    The event loop runs other requests whenever the coroutine awaits, so
+    profiling across the whole await would record their work too. The
+    coroutine is driven step by step instead, with the profiler enabled
+    for each step and disabled while it is suspended.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.finished = False
+
+    def _enable(self) -> bool:
+        try:
+            self.profile.enable()
+            return True
+        except ValueError:
+            # Another profiler is active; this step goes unprofiled
+            return False
+
+    def finish(self):
+        """Stop profiling for good; later steps run unprofiled."""
+        self.finished = True
+        self.profile.disable()
+
+    @types.coroutine
+    def run(self, coro):
+        send, message = coro.send, None
+        while True:
+            enabled = not self.finished and self._enable()
+            try:
+                yielded = send(message)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if enabled:
+                    self.profile.disable()
+            try:
+                message, send = (yield yielded), coro.send
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as exc:
+                message, send = exc, coro.throw
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling the requests selected by RequestProfiler.
+
+    Add it innermost so it runs in the task that call_next starts for the
+    request; only that task's steps are profiled. Profiling ends when the
+    response starts, so the outer middleware can write the profile as soon
+    as call_next returns; a streamed body's generation is not included.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        request_profile = _active_profile.get()
+        if request_profile is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        task_profile = _TaskProfile()
+        request_profile.add(task_profile.profile)
+
+        async def send_until_started(message):
+            if message["type"] == "http.response.start":
+                task_profile.finish()
+            await send(message)
+
+        await task_profile.run(self.app(scope, receive, send_until_started))
+
+
+def _safe_filename(route: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+
+
+class RequestProfiler:
+    """Decides which requests to profile and writes their pstats files.
+
+    A request is profiled when it carries X-Profile: <INTERNAL_API_TOKEN>, or
+    when its route template was armed through /internal/profiling. Either
+    way, at most PROFILE_MAX_CONCURRENT requests run under the profiler at
+    once and PROFILE_MAX_PER_MINUTE per minute; others run unprofiled.
+
+    A profile covers the request's own steps on the event loop (see
+    ProfilingMiddleware) and its run_in_threadpool calls, not other
+    requests served meanwhile. On Python 3.12+, where cProfile observes
+    every thread while enabled, threadpool work of concurrent requests can
+    still appear; use a sampling profiler for exact attribution under load.
+    """
+
+    def __init__(self, directory: str | None, max_per_minute: int, max_concurrent: int):
+        self.directory = directory
+        self.max_per_minute = max_per_minute
+        self.max_concurrent = max_concurrent
+        self.armed: dict[str, int] = {}
+        self.skipped = 0
+        self._started: deque[float] = deque()
+        self._running = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def arm(self, route: str, requests: int):
+        """Profile the next `requests` requests to a route template (0 disarms)."""
+        with self._lock:
+            if requests > 0:
+                self.armed[route] = requests
+            else:
+                self.armed.pop(route, None)
+
+    def _requested(self, headers, route: str) -> bool:
+        token = headers.get(PROFILE_HEADER)
+        expected = os.getenv("INTERNAL_API_TOKEN")
+        if token is not None and expected and secrets.compare_digest(token, expected):
+            return True
+        return self.armed.get(route, 0) > 0
+
+    def _acquire(self, route: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            while self._started and now - self._started[0] > 60:
+                self._started.popleft()
+            if self._running >= self.max_concurrent or len(self._started) >= self.max_per_minute:
+                self.skipped += 1
+                return False
+            self._started.append(now)
+            self._running += 1
+            if route in self.armed:
+                self.armed[route] -= 1
+                if self.armed[route] <= 0:
+                    del self.armed[route]
+            return True
+
+    def _release(self):
+        with self._lock:
+            self._running -= 1
+
+    def should_profile(self, headers, route: str) -> bool:
+        return self.enabled and self._requested(headers, route) and self._acquire(route)
+
+    @contextmanager
+    def profile(self):
+        """Mark the request handled in the block for profiling.
+
+        ProfilingMiddleware and run_in_threadpool add their profiles to the
+        yielded _RequestProfile, which write() then merges.
+        """
+        request_profile = _RequestProfile()
+        token = _active_profile.set(request_profile)
+        try:
+            yield request_profile
+        finally:
+            _active_profile.reset(token)
+            self._release()
+
+    def write(self, request_profile: _RequestProfile, method: str, route: str) -> str | None:
+        """Merge the request's profiles into one .pstats file; returns its name."""
+        if not request_profile.profiles:
+            return None
+        stats = pstats.Stats(request_profile.profiles[0])
+        for profile in request_profile.profiles[1:]:
+            stats.add(profile)
+        os.makedirs(self.directory, exist_ok=True)
+        filename = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{method}-{_safe_filename(route)}-"
+            f"{uuid.uuid4().hex[:8]}.pstats"
+        )
+        stats.dump_stats(os.path.join(self.directory, filename))
+        return filename
+
+    def recent(self, limit: int = 50) -> list[str]:
+        """Most recent profile files, newest first."""
+        if not self.enabled or not os.path.isdir(self.directory):
+            return []
+        return sorted((f for f in os.listdir(self.directory) if f.endswith(".pstats")), reverse=True)[:limit]
+
+
+request_profiler = RequestProfiler(PROFILING_DIR, PROFILE_MAX_PER_MINUTE, PROFILE_MAX_CONCURRENT)
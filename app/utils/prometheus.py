@@ -0,0 +1,256 @@
+import asyncio
+import glob
+import json
+import math
+import os
+import threading
+
+from starlette.routing import Match
+
+from app.utils.metrics import LATENCY_BUCKETS, Histogram
+from app.utils.pool_metrics import get_pool_metrics
+from app.utils.security import bcrypt_pool
+
+# When set, each worker process writes its metrics to this directory and
+# /metrics serves the sum over all workers (e.g. under uvicorn --workers N).
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Metric families are plain dicts so they can be written to and read back
+# from the multi-worker snapshot files:
+#   {name: {"type": ..., "help": ..., "samples": [[suffix, labels, value], ...]}}
+
+
+def _family(metric_type: str, help_text: str) -> dict:
+    return {"type": metric_type, "help": help_text, "samples": []}
+
+
+def _add_histogram(family: dict, snapshot: dict, labels: dict):
+    """Append a Histogram.snapshot() as Prometheus _bucket/_count/_sum samples."""
+    for bound, count in snapshot["buckets"].items():
+        family["samples"].append(["_bucket", {**labels, "le": bound}, count])
+    family["samples"].append(["_count", labels, snapshot["count"]])
+    family["samples"].append(["_sum", labels, snapshot["sum"]])
+
+
+class RequestMetrics:
+    """Request counts, latencies and in-flight requests per route template."""
+
+    def __init__(self):
+        self._requests: dict[tuple[str, str, int], int] = {}
+        self._durations: dict[tuple[str, str], Histogram] = {}
+        self._in_flight: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def started(self, method: str, route: str):
+        with self._lock:
+            key = (method, route)
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+    def finished(self, method: str, route: str, status_code: int, duration: float):
+        with self._lock:
+            key = (method, route)
+            self._in_flight[key] -= 1
+            histogram = self._durations.get(key)
+            if histogram is None:
+                histogram = self._durations[key] = Histogram(LATENCY_BUCKETS)
+            self._requests[(method, route, status_code)] = self._requests.get((method, route, status_code), 0) + 1
+        histogram.observe(duration)
+
+    def collect(self) -> dict:
+        requests = _family("counter", "HTTP requests handled, by route template and status.")
+        durations = _family("histogram", "HTTP request latency in seconds, by route template.")
+        in_flight = _family("gauge", "HTTP requests currently being handled, by route template.")
+        with self._lock:
+            request_counts = dict(self._requests)
+            histograms = dict(self._durations)
+            in_flight_counts = dict(self._in_flight)
+        for (method, route, status_code), count in sorted(request_counts.items()):
+            requests["samples"].append(["", {"method": method, "route": route, "status": str(status_code)}, count])
+        for (method, route), histogram in sorted(histograms.items()):
+            _add_histogram(durations, histogram.snapshot(), {"method": method, "route": route})
+        for (method, route), count in sorted(in_flight_counts.items()):
+            in_flight["samples"].append(["", {"method": method, "route": route}, count])
+        return {
+            "http_requests_total": requests,
+            "http_request_duration_seconds": durations,
+            "http_requests_in_flight": in_flight,
+        }
+
+
+request_metrics = RequestMetrics()
+
+
+def route_template(routes, scope) -> str:
+    """Return the path template of the route a request matches, e.g. /tasks/{task_id}.
+
+    Labelling by template rather than raw path keeps the number of series
+    bounded; requests matching no route share the "unmatched" label.
+    """
+    partial = None
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match is Match.FULL:
+            return route.path
+        if match is Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or "unmatched"
+
+
+def _pool_families() -> dict:
+    gauges = {
+        "size": "Configured connection pool size.",
+        "checked_out": "Connections currently checked out of the pool.",
+        "idle": "Idle connections held by the pool.",
+        "overflow": "Connections open beyond the pool size.",
+    }
+    counters = {
+        "connects": "Connections opened by the pool.",
+        "checkouts": "Connection checkouts from the pool.",
+        "checkins": "Connections returned to the pool.",
+        "invalidations": "Connections invalidated (discarded) by the pool.",
+        "timeouts": "Checkouts that timed out waiting for a connection.",
+    }
+    families = {f"db_pool_{key}": _family("gauge", text) for key, text in gauges.items()}
+    families.update({f"db_pool_{key}_total": _family("counter", text) for key, text in counters.items()})
+    wait = families["db_pool_checkout_wait_seconds"] = _family(
+        "histogram", "Time spent waiting for a pool connection, in seconds."
+    )
+    for name, snapshot in get_pool_metrics().items():
+        labels = {"pool": name}
+        for key in gauges:
+            if key in snapshot:
+                families[f"db_pool_{key}"]["samples"].append(["", labels, snapshot[key]])
+        for key in counters:
+            families[f"db_pool_{key}_total"]["samples"].append(["", labels, snapshot[key]])
+        _add_histogram(wait, snapshot["checkout_wait_seconds"], labels)
+    return families
+
+
+def _bcrypt_families() -> dict:
+    stats = bcrypt_pool.stats()
+    families = {
+        "bcrypt_pool_workers": _family("gauge", "Threads available for password hashing."),
+        "bcrypt_pool_running": _family("gauge", "Password hashes currently running."),
+        "bcrypt_pool_queue_depth": _family("gauge", "Password hashes waiting for a worker."),
+        "bcrypt_pool_rejected_total": _family("counter", "Password hashes rejected because the queue was full."),
+        "bcrypt_pool_queue_wait_seconds": _family("histogram", "Time password hashes waited for a worker, in seconds."),
+        "bcrypt_pool_hash_seconds": _family("histogram", "Time spent hashing or verifying a password, in seconds."),
+    }
+    families["bcrypt_pool_workers"]["samples"].append(["", {}, stats["workers"]])
+    families["bcrypt_pool_running"]["samples"].append(["", {}, stats["running"]])
+    families["bcrypt_pool_queue_depth"]["samples"].append(["", {}, stats["queued"]])
+    families["bcrypt_pool_rejected_total"]["samples"].append(["", {}, stats["rejected"]])
+    _add_histogram(families["bcrypt_pool_queue_wait_seconds"], stats["queue_wait_seconds"], {})
+    _add_histogram(families["bcrypt_pool_hash_seconds"], stats["hash_seconds"], {})
+    return families
+
+
+def collect() -> dict:
+    """Collect every metric family of this process."""
+    return {**request_metrics.collect(), **_pool_families(), **_bcrypt_families()}
+
+
+def _worker_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"worker-{pid}.json")
+
+
+def write_worker_snapshot(directory: str, families: dict | None = None):
+    """Atomically write this process's metrics for other workers to aggregate."""
+    path = _worker_path(directory, os.getpid())
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"pid": os.getpid(), "families": families or collect()}, f)
+    os.replace(tmp_path, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def aggregate(directory: str) -> dict:
+    """Sum the metrics of every worker that has written to the directory.
+
+    Counters and histograms of exited workers are kept so totals never go
+    backwards; their gauges are dropped.
+    """
+    merged: dict = {}
+    for path in sorted(glob.glob(os.path.join(directory, "worker-*.json"))):
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        alive = _pid_alive(snapshot["pid"])
+        for name, family in snapshot["families"].items():
+            if family["type"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(name, {**family, "samples": {}})
+            for suffix, labels, value in family["samples"]:
+                key = (suffix, tuple(sorted(labels.items())))
+                target["samples"][key] = target["samples"].get(key, 0) + value
+    for family in merged.values():
+        samples = [[suffix, dict(labels), value] for (suffix, labels), value in family["samples"].items()]
+        family["samples"] = sorted(samples, key=_sample_order)
+    return merged
+
+
+_SUFFIX_ORDER = {"": 0, "_bucket": 0, "_count": 1, "_sum": 2}
+
+
+def _sample_order(sample):
+    """Keep each series' buckets (ascending le), _count and _sum together."""
+    suffix, labels, _ = sample
+    series = sorted((key, val) for key, val in labels.items() if key != "le")
+    le = labels.get("le")
+    return series, _SUFFIX_ORDER[suffix], float(le) if le is not None else 0.0
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+
+def render(families: dict) -> str:
+    """Render metric families in the Prometheus text exposition format."""
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for suffix, labels, value in family["samples"]:
+            label_text = ""
+            if labels:
+                label_text = "{" + ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items()) + "}"
+            lines.append(f"{name}{suffix}{label_text} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+async def run_metrics_flush():
+    """Background task: keep this worker's snapshot fresh for scrapes served by other workers."""
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+        write_worker_snapshot(METRICS_MULTIPROC_DIR)
+
+
+def exposition() -> str:
+    """Metrics for a scrape: this process alone, or all workers in multi-worker mode."""
+    if not METRICS_MULTIPROC_DIR:
+        return render(collect())
+    write_worker_snapshot(METRICS_MULTIPROC_DIR)
+    return render(aggregate(METRICS_MULTIPROC_DIR))
@@ -0,0 +1,34 @@
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Raise instead of logging when a route exceeds its budget (enabled in tests)
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "false").lower() in ("1", "true", "yes", "on")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A request issued more SQL statements than its route's budget allows."""
+
+
+def query_budget(max_queries: int):
+    """Declare the most SQL statements one request to this route may issue.
+
+    Place it below the router decorator. Budgets count every statement,
+    including the authentication lookup, and are checked by the request
+    middleware after the response is produced.
+    """
+    def decorator(endpoint):
+        endpoint.query_budget = max_queries
+        return endpoint
+    return decorator
+
+
+def check_query_budget(endpoint, route: str, queries: int):
+    budget = getattr(endpoint, "query_budget", None)
+    if budget is None or queries <= budget:
+        return
+    message = f"Query budget exceeded route={route} queries={queries} budget={budget}"
+    if QUERY_BUDGET_STRICT:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
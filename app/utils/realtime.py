@@ -0,0 +1,224 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# "postgres" fans events out to every worker through LISTEN/NOTIFY, "local"
+# delivers them to subscribers of this process only, "off" disables them
+REALTIME_BACKEND = os.getenv("REALTIME_BACKEND", "postgres").lower()
+# Events buffered per subscriber; a subscriber that falls further behind is dropped
+REALTIME_QUEUE_SIZE = int(os.getenv("REALTIME_QUEUE_SIZE", "256"))
+# A subscriber whose socket accepts no event for this long is dropped
+REALTIME_SEND_TIMEOUT = float(os.getenv("REALTIME_SEND_TIMEOUT", "10"))
+# SSE comment sent on idle streams so proxies keep them open
+REALTIME_HEARTBEAT_SECONDS = float(os.getenv("REALTIME_HEARTBEAT_SECONDS", "15"))
+
+REALTIME_CHANNEL = "task_events"
+# NOTIFY payloads must be shorter than 8000 bytes
+MAX_NOTIFY_PAYLOAD = 7999
+# Session.info key holding the events of the current transaction
+PENDING_EVENTS = "realtime_events"
+
+# Sent to subscribers that may have missed events; clients then catch up
+# through GET /tasks/changes
+RESYNC_MESSAGE = '{"type":"resync"}'
+
+
+def task_event(event_type: str, task) -> str:
+    """Encode a task.created / task.updated event for a TaskResponse.
+
+    Events are "<projectId> <json>" so they can be routed without parsing.
+    Tasks too large for a NOTIFY payload are sent as a partial event that
+    the client completes with GET /tasks/{id}.
+    """
+    wire = f'{task.projectId} {{"type":"{event_type}","task":{task.model_dump_json()}}}'
+    if len(wire.encode()) <= MAX_NOTIFY_PAYLOAD:
+        return wire
+    summary = {"id": task.id, "projectId": task.projectId, "updatedAt": task.updatedAt.isoformat()}
+    return f'{task.projectId} {json.dumps({"type": event_type, "task": summary, "partial": True})}'
+
+
+def task_deleted_event(task_id: str, project_id: str) -> str:
+    return f'{project_id} {json.dumps({"type": "task.deleted", "id": task_id})}'
+
+
+def stage_events(db, events):
+    """Queue events to be published when the session's transaction commits.
+
+    With the postgres backend they are sent with pg_notify inside the
+    transaction, so they are delivered only if it commits; otherwise they
+    are dispatched to this process's subscribers right after the commit.
+    """
+    if REALTIME_BACKEND != "off":
+        db.info.setdefault(PENDING_EVENTS, []).extend(events)
+
+
+class Subscription:
+    """A subscriber's bounded queue of encoded events, owned by its event loop."""
+
+    def __init__(self, project_id: str, maxsize: int):
+        self.project_id = project_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize)
+        self.dropped = False
+
+    async def get(self) -> str | None:
+        """Next event, or None once the subscriber has been dropped."""
+        return await self.queue.get()
+
+
+class Broker:
+    """In-process pub/sub of task events, keyed by project.
+
+    Each event is encoded once and the same string is queued for every
+    subscriber. Subscribers whose queue is full are dropped instead of
+    blocking the publisher or buffering without bound.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.delivered = 0
+        self.dropped = 0
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, project_id: str) -> Subscription:
+        subscription = Subscription(project_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.project_id]
+
+    def _offer(self, subscription: Subscription, message: str):
+        if subscription.dropped:
+            return
+        try:
+            subscription.queue.put_nowait(message)
+            self.delivered += 1
+        except asyncio.QueueFull:
+            subscription.dropped = True
+            self.dropped += 1
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(None)
+
+    def _deliver(self, subscriptions, message: str):
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            # Committed from a threadpool worker (sync mode)
+            current = None
+        for subscription in subscriptions:
+            if subscription.loop is current:
+                self._offer(subscription, message)
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(self._offer, subscription, message)
+            except RuntimeError:
+                # Its event loop has closed
+                self.unsubscribe(subscription)
+
+    def dispatch(self, wire: str):
+        """Deliver an encoded "<projectId> <json>" event to the project's subscribers."""
+        project_id, _, message = wire.partition(" ")
+        with self._lock:
+            subscriptions = list(self._subscribers.get(project_id, ()))
+        if subscriptions:
+            self._deliver(subscriptions, message)
+
+    def resync_all(self):
+        with self._lock:
+            subscriptions = [s for subscribers in self._subscribers.values() for s in subscribers]
+        self._deliver(subscriptions, RESYNC_MESSAGE)
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscribers = sum(len(s) for s in self._subscribers.values())
+            projects = len(self._subscribers)
+        return {
+            "backend": REALTIME_BACKEND,
+            "subscribers": subscribers,
+            "projects": projects,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+broker = Broker(REALTIME_QUEUE_SIZE)
+
+
+class NotifyListener:
+    """One LISTEN connection per process, feeding NOTIFY payloads to the broker.
+
+    Reconnects with backoff; after a reconnect every subscriber is sent a
+    resync message, since notifications sent meanwhile were lost.
+    """
+
+    def __init__(self, database_url: str, broker: Broker):
+        self.conninfo = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.broker = broker
+        self.connected = False
+        self.connections = 0
+
+    async def run(self):
+        import psycopg
+
+        delay = 1.0
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(self.conninfo, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {REALTIME_CHANNEL}")
+                    self.connected = True
+                    self.connections += 1
+                    delay = 1.0
+                    if self.connections > 1:
+                        self.broker.resync_all()
+                    async for notify in conn.notifies():
+                        self.broker.dispatch(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Realtime listener disconnected: {e}")
+            self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+# Registered on the Session class so request, background and test sessions
+# (sync, or the sync side of an AsyncSession) all publish their events.
+@event.listens_for(Session, "before_commit")
+def _notify_in_transaction(session):
+    events = session.info.get(PENDING_EVENTS)
+    if not events or REALTIME_BACKEND != "postgres" or session.get_bind().dialect.name != "postgresql":
+        return
+    # One statement for any number of events
+    session.execute(
+        text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+        {"channel": REALTIME_CHANNEL, "payloads": events},
+    )
+    session.info[PENDING_EVENTS] = []
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_after_commit(session):
+    for wire in session.info.pop(PENDING_EVENTS, None) or ():
+        broker.dispatch(wire)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_events(session):
+    session.info.pop(PENDING_EVENTS, None)
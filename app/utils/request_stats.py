@@ -0,0 +1,77 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """SQL statements and database time attributed to one request."""
+    route: str | None = None
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_time: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Render a Server-Timing header value (durations in milliseconds)."""
+        return (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", '
+            f"total;dur={self.elapsed * 1000:.1f}"
+        )
+
+
+# Holds a mutable RequestStats so statements run in threadpool workers (which
+# get a copy of the context) still add to the request's totals.
+_current_stats: contextvars.ContextVar[RequestStats | None] = contextvars.ContextVar(
+    "request_stats", default=None
+)
+
+
+def current_request_stats() -> RequestStats | None:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_request(route: str | None = None):
+    """Attribute SQL statements executed within the block to a new RequestStats."""
+    stats = RequestStats(route)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+# Registered on the Engine class so the primary, replica and async engines
+# (and any engine created later) are all covered.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _record_statement(conn):
+    stats = _current_stats.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    stats.queries += 1
+    stats.db_time += time.perf_counter() - started.pop()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_statement(conn)
+
+
+@event.listens_for(Engine, "handle_error")
+def _statement_failed(exception_context):
+    if exception_context.connection is not None and exception_context.execution_context is not None:
+        _record_statement(exception_context.connection)
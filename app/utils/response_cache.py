@@ -0,0 +1,231 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from fastapi import Response
+
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# "off", "memory" (per process: single-worker deployments only) or "redis"
+# (shared by all workers; needs the redis package and RESPONSE_CACHE_REDIS_URL)
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "off").lower()
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+# Bounds how long a response read from a lagging replica can outlive a write
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+# Limits of the memory backend
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+
+def project_scope(project_id: str) -> str:
+    """Version scope covering a project's tasks."""
+    return f"project:{project_id}"
+
+
+def task_scope(task_id: str) -> str:
+    return f"task:{task_id}"
+
+
+def user_projects_scope(user_id: str) -> str:
+    """Version scope covering the projects listed for a user."""
+    return f"user-projects:{user_id}"
+
+
+class MemoryBackend:
+    """In-process backend: a TTLCache of encoded responses bounded by total size.
+
+    Scope versions come from one global generation counter rather than a
+    per-scope count, so a scope dropped from the bounded version table comes
+    back with a never-used value instead of colliding with entries cached
+    under an earlier one.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float, max_scopes: int = 100_000):
+        self.responses = TTLCache(maxsize=max_entries, ttl=ttl, max_bytes=max_bytes)
+        self.max_scopes = max_scopes
+        self._versions: OrderedDict[str, int] = OrderedDict()
+        self._generation = itertools.count(1)
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        return self.responses.get(key)
+
+    async def set(self, key: str, value: bytes):
+        self.responses.set(key, value)
+
+    async def versions(self, scopes: list[str]) -> list[int]:
+        with self._lock:
+            result = []
+            for scope in scopes:
+                version = self._versions.get(scope)
+                if version is None:
+                    version = self._versions[scope] = next(self._generation)
+                self._versions.move_to_end(scope)
+                result.append(version)
+            self._trim()
+            return result
+
+    async def bump(self, scopes: list[str]):
+        with self._lock:
+            for scope in scopes:
+                self._versions[scope] = next(self._generation)
+                self._versions.move_to_end(scope)
+            self._trim()
+
+    def _trim(self):
+        while len(self._versions) > self.max_scopes:
+            self._versions.popitem(last=False)
+
+    async def close(self):
+        self.responses.clear()
+
+
+class RedisBackend:
+    """Shared backend on Redis, using the same generation scheme as MemoryBackend."""
+
+    GENERATION_KEY = "rc:generation"
+
+    def __init__(self, url: str, ttl: int):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the redis package") from e
+        self._redis = redis.from_url(url)
+        self.ttl = ttl
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes):
+        await self._redis.set(key, value, ex=self.ttl)
+
+    async def versions(self, scopes: list[str]) -> list[int]:
+        keys = [f"rc:version:{scope}" for scope in scopes]
+        values = await self._redis.mget(keys)
+        for index, value in enumerate(values):
+            if value is None:
+                generation = await self._redis.incr(self.GENERATION_KEY)
+                await self._redis.set(keys[index], generation, nx=True)
+                values[index] = await self._redis.get(keys[index])
+        return [int(value) for value in values]
+
+    async def bump(self, scopes: list[str]):
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                generation = await self._redis.incr(self.GENERATION_KEY)
+                pipe.set(f"rc:version:{scope}", generation)
+            await pipe.execute()
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def _encode(response: Response) -> bytes:
+    headers = {
+        key: value for key, value in response.headers.items()
+        if key not in ("content-length", CACHE_STATUS_HEADER.lower())
+    }
+    return json.dumps({"status": response.status_code, "headers": headers}).encode() + b"\n" + response.body
+
+
+def _decode(value: bytes) -> Response:
+    meta, body = value.split(b"\n", 1)
+    meta = json.loads(meta)
+    response = Response(content=body, status_code=meta["status"], headers=meta["headers"])
+    response.headers[CACHE_STATUS_HEADER] = "HIT"
+    return response
+
+
+class ResponseCache:
+    """Cache of rendered read responses, invalidated by per-scope versions.
+
+    Keys combine the route, its parameters and the current version of every
+    scope the response depends on. Writes bump the scopes they touch after
+    committing, which orphans every affected entry in O(1); orphans age out
+    of the LRU or expire after RESPONSE_CACHE_TTL.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def lookup(self, name: str, scopes: list[str], params) -> tuple[str | None, Response | None]:
+        """Return (key, cached response or None); the key is None when caching is off."""
+        if self.backend is None:
+            return None, None
+        try:
+            versions = await self.backend.versions(scopes)
+            digest = hashlib.blake2b(repr(sorted(params)).encode(), digest_size=16).hexdigest()
+            key = f"rc:{name}:{'.'.join(map(str, versions))}:{digest}"
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+            return None, None
+        if value is None:
+            self.misses += 1
+            return key, None
+        self.hits += 1
+        return key, _decode(value)
+
+    async def store(self, key: str | None, response: Response) -> Response:
+        """Cache a successful response under a key from lookup(); returns the response."""
+        if key is None:
+            return response
+        response.headers[CACHE_STATUS_HEADER] = "MISS"
+        if response.status_code == 200:
+            try:
+                await self.backend.set(key, _encode(response))
+            except Exception as e:
+                logger.warning(f"Response cache store failed: {e}")
+        return response
+
+    async def invalidate(self, *scopes: str):
+        """Bump the given scopes; call after the write has committed."""
+        if self.backend is None or not scopes:
+            return
+        try:
+            await self.backend.bump(list(dict.fromkeys(scopes)))
+        except Exception as e:
+            logger.error(f"Response cache invalidation failed: {e}")
+
+    async def close(self):
+        if self.backend is not None:
+            await self.backend.close()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        stats = {
+            "backend": RESPONSE_CACHE_BACKEND if self.enabled else "off",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+        if isinstance(self.backend, MemoryBackend):
+            stats["memory"] = self.backend.responses.stats()
+        return stats
+
+
+def create_backend():
+    if RESPONSE_CACHE_BACKEND == "off":
+        return None
+    if RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryBackend(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL)
+    if RESPONSE_CACHE_BACKEND == "redis":
+        return RedisBackend(RESPONSE_CACHE_REDIS_URL, RESPONSE_CACHE_TTL)
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {RESPONSE_CACHE_BACKEND!r} (expected 'off', 'memory' or 'redis')")
+
+
+response_cache = ResponseCache(create_backend())
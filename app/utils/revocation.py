@@ -0,0 +1,44 @@
+import time
+
+
+class TokenVersionMap:
+    """Per-user minimum valid token version, used to revoke access tokens.
+
+    Only users who have ever revoked their tokens (tokenVersion > 0) are
+    held, so the map stays small. A token is revoked when its "ver" claim is
+    below the user's current version.
+    """
+
+    def __init__(self):
+        self._versions: dict[str, int] = {}
+        self._deleted: set[str] = set()
+        self.refreshed_at: float | None = None
+
+    def is_revoked(self, user_id: str, version: int) -> bool:
+        if user_id in self._deleted:
+            return True
+        return version < self._versions.get(user_id, 0)
+
+    def bump(self, user_id: str, version: int):
+        """Record a revocation made in this process ahead of the next refresh."""
+        self._versions[user_id] = max(version, self._versions.get(user_id, 0))
+
+    def mark_deleted(self, user_id: str):
+        """Revoke every token of a user deleted in this process."""
+        self._deleted.add(user_id)
+
+    def replace(self, versions: dict[str, int], deleted: set[str] | None = None):
+        """Swap in versions and deleted user ids freshly loaded from the database."""
+        self._versions = versions
+        self._deleted = deleted or set()
+        self.refreshed_at = time.time()
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._versions),
+            "deleted": len(self._deleted),
+            "refreshed_at": self.refreshed_at,
+        }
+
+
+token_versions = TokenVersionMap()
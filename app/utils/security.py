@@ -1,10 +1,192 @@
+import os
+import asyncio
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+from app.utils.metrics import Histogram
+
+# bcrypt takes hundreds of milliseconds per call; the defaults keep one
+# worker per core and only a short queue behind them.
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(os.cpu_count() or 1)))
+BCRYPT_MAX_QUEUE = int(os.getenv("BCRYPT_MAX_QUEUE", str(4 * BCRYPT_WORKERS)))
+
+# Buckets (seconds) for bcrypt queue-wait and hash-time histograms
+BCRYPT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Work factor: fixed by BCRYPT_ROUNDS, otherwise calibrated at startup so
+# one hash takes about BCRYPT_TARGET_MS, never below BCRYPT_MIN_ROUNDS.
+BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", "250"))
+BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", "12"))
+BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", "16"))
+_configured_rounds = os.getenv("BCRYPT_ROUNDS")
+bcrypt_rounds = int(_configured_rounds) if _configured_rounds else BCRYPT_MIN_ROUNDS
+
+# Cost used for the calibration measurement
+_CALIBRATION_ROUNDS = 10
+
+logger = logging.getLogger(__name__)
+
+
+def choose_bcrypt_rounds(
+    seconds_at_base: float,
+    base_rounds: int,
+    target_seconds: float,
+    min_rounds: int,
+    max_rounds: int,
+) -> int:
+    """Pick the largest cost whose estimated hash time fits the target.
+
+    Each extra round doubles the work, so the estimate for cost c is
+    seconds_at_base * 2 ** (c - base_rounds).
+    """
+    if seconds_at_base <= 0:
+        return max_rounds
+    rounds = base_rounds + math.floor(math.log2(target_seconds / seconds_at_base))
+    return max(min_rounds, min(max_rounds, rounds))
+
+
+def calibrate_bcrypt_rounds() -> int:
+    """Set the work factor for this process (a no-op when BCRYPT_ROUNDS is set)."""
+    global bcrypt_rounds
+    if _configured_rounds:
+        logger.info(f"bcrypt rounds fixed by BCRYPT_ROUNDS: {bcrypt_rounds}")
+        return bcrypt_rounds
+
+    salt = bcrypt.gensalt(rounds=_CALIBRATION_ROUNDS)
+    samples = []
+    for _ in range(3):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", salt)
+        samples.append(time.perf_counter() - start)
+
+    bcrypt_rounds = choose_bcrypt_rounds(
+        min(samples),
+        _CALIBRATION_ROUNDS,
+        BCRYPT_TARGET_MS / 1000,
+        BCRYPT_MIN_ROUNDS,
+        BCRYPT_MAX_ROUNDS,
+    )
+    estimate_ms = min(samples) * 2 ** (bcrypt_rounds - _CALIBRATION_ROUNDS) * 1000
+    logger.info(f"bcrypt rounds calibrated to {bcrypt_rounds} (~{estimate_ms:.0f} ms per hash)")
+    return bcrypt_rounds
+
+
+def hash_rounds(hashed: str) -> int | None:
+    """Return the cost factor encoded in a bcrypt hash ($2b$<cost>$...)."""
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(hashed: str) -> bool:
+    """Whether a stored hash should be re-created at the current work factor.
+
+    Weaker hashes are always upgraded. Stronger ones are only downgraded
+    when more than one round above the target, so workers whose
+    calibrations differ by one round do not rehash back and forth.
+    """
+    rounds = hash_rounds(hashed)
+    if rounds is None:
+        return False
+    return rounds < bcrypt_rounds or rounds > bcrypt_rounds + 1
+
+
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    salt = bcrypt.gensalt()
+    """Hash a password using bcrypt at the current work factor."""
+    salt = bcrypt.gensalt(rounds=bcrypt_rounds)
     return bcrypt.hashpw(password.encode(), salt).decode()
 
 def verify_password(password: str, hashed: str) -> bool:
     """Verify a password against its hash."""
     return bcrypt.checkpw(password.encode(), hashed.encode())
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the bcrypt pool's queue is full."""
+
+
+class BcryptPool:
+    """Bounded worker pool for bcrypt work, kept off the event loop and default threadpool.
+
+    At most workers + max_queue jobs may be pending; further submissions
+    raise PasswordHasherBusy instead of queuing without bound.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rejected = 0
+        self.queue_wait = Histogram(BCRYPT_BUCKETS)
+        self.hash_time = Histogram(BCRYPT_BUCKETS)
+        self._pending = 0
+        self._running = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _timed(self, submitted_at: float, fn, args):
+        started = time.perf_counter()
+        self.queue_wait.observe(started - submitted_at)
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            self.hash_time.observe(time.perf_counter() - started)
+            with self._lock:
+                self._running -= 1
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+            future = self._executor.submit(self._timed, time.perf_counter(), fn, args)
+            self._pending += 1
+        # Released when the job finishes, not when the caller stops waiting:
+        # a cancelled request (e.g. client disconnect) leaves its job queued
+        future.add_done_callback(self._job_done)
+        return await asyncio.wrap_future(future)
+
+    def _job_done(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending, running = self._pending, self._running
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queued": max(pending - running, 0),
+            "rejected": self.rejected,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+            "hash_seconds": self.hash_time.snapshot(),
+        }
+
+
+bcrypt_pool = BcryptPool(BCRYPT_WORKERS, BCRYPT_MAX_QUEUE)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bcrypt pool. Raises PasswordHasherBusy when saturated."""
+    return await bcrypt_pool.run(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """Verify a password on the bcrypt pool. Raises PasswordHasherBusy when saturated."""
+    return await bcrypt_pool.run(verify_password, password, hashed)
@@ -0,0 +1,148 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from app.utils.cache import TTLCache
+from app.utils.request_stats import current_request_stats
+
+logger = logging.getLogger(__name__)
+
+# Statements slower than this are logged and kept in the ring buffer; 0 disables
+SLOW_QUERY_THRESHOLD = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500")) / 1000
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "100"))
+# Re-run slow SELECTs under EXPLAIN (ANALYZE, BUFFERS) on a separate connection
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "false").lower() in ("1", "true", "yes", "on")
+# Explain a given statement at most once per this many seconds
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "60"))
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "10000"))
+# Statements remembered as recently explained; texts differing only in
+# literals (e.g. IN lists of varying length) would otherwise pile up
+SLOW_QUERY_EXPLAIN_TRACKED = 1000
+
+
+@dataclass(slots=True)
+class SlowQuery:
+    statement: str
+    parameters: object
+    route: str | None
+    duration_ms: float
+    recorded_at: float
+    explain: str | None = None
+
+
+def redact_parameters(parameters, executemany: bool = False):
+    """Replace bound values with their type names so no user data is logged."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: _redact(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact(value) for value in parameters]
+    return parameters
+
+
+def _redact(value):
+    return None if value is None else f"<{type(value).__name__}>"
+
+
+def _explainable(statement: str) -> bool:
+    # EXPLAIN ANALYZE executes the statement, so only plain reads qualify
+    text = statement.lstrip().lower()
+    return text.startswith(("select", "with")) and " for update" not in text and " for share" not in text
+
+
+class SlowQueryLog:
+    """Ring buffer of recent slow statements, with optional background EXPLAIN capture."""
+
+    def __init__(self, maxsize: int):
+        self._entries: deque[SlowQuery] = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+        self._explained = TTLCache(SLOW_QUERY_EXPLAIN_TRACKED, SLOW_QUERY_EXPLAIN_INTERVAL)
+        self._explain_engine = None
+        # One worker so captures never add more than one extra query at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+
+    def record(self, conn, statement, parameters, executemany, duration: float) -> SlowQuery:
+        stats = current_request_stats()
+        entry = SlowQuery(
+            statement=statement,
+            parameters=redact_parameters(parameters, executemany),
+            route=stats.route if stats is not None else None,
+            duration_ms=round(duration * 1000, 1),
+            recorded_at=time.time(),
+        )
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning(
+            f"Slow query route={entry.route} duration_ms={entry.duration_ms} "
+            f"statement={' '.join(statement.split())!r} parameters={entry.parameters}"
+        )
+        if SLOW_QUERY_EXPLAIN and not executemany and self._should_explain(conn, statement):
+            self._executor.submit(self._explain, conn.engine.url, entry, statement, parameters)
+        return entry
+
+    def _should_explain(self, conn, statement: str) -> bool:
+        if conn.dialect.name != "postgresql" or not _explainable(statement):
+            return False
+        with self._lock:
+            if self._explained.get(statement) is not None:
+                return False
+            self._explained.set(statement, True)
+        return True
+
+    def _explain(self, url, entry: SlowQuery, statement: str, parameters):
+        try:
+            if self._explain_engine is None or self._explain_engine.url != url:
+                # Its own unpooled connection, outside the application's pool
+                self._explain_engine = create_engine(url, poolclass=NullPool)
+            with self._explain_engine.connect() as conn:
+                conn.exec_driver_sql(f"SET LOCAL statement_timeout = {SLOW_QUERY_EXPLAIN_TIMEOUT_MS}")
+                rows = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters).all()
+                conn.rollback()
+            entry.explain = "\n".join(row[0] for row in rows)
+        except Exception as e:
+            entry.explain = f"EXPLAIN failed: {e}"
+            logger.warning(f"EXPLAIN of slow query failed: {e}")
+
+    def recent(self) -> list[dict]:
+        """Recorded slow queries, newest first."""
+        with self._lock:
+            entries = list(self._entries)
+        return [asdict(entry) for entry in reversed(entries)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._explained.clear()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._explain_engine is not None:
+            self._explain_engine.dispose()
+
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_BUFFER_SIZE)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _check_duration(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_slow_query_started", None)
+    if started is None or not SLOW_QUERY_THRESHOLD:
+        return
+    duration = time.perf_counter() - started
+    if duration >= SLOW_QUERY_THRESHOLD:
+        slow_query_log.record(conn, statement, parameters, executemany, duration)
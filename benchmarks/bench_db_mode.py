@@ -0,0 +1,73 @@
+"""Load test for comparing DATABASE_MODE=sync and DATABASE_MODE=async.
+
+Start the API in one mode, run this script, then restart in the other mode
+and run it again:
+
+    DATABASE_MODE=async uvicorn app.main:app --workers 1
+    python benchmarks/bench_db_mode.py --url http://localhost:8000 --concurrency 200
+
+The script fires `--requests` GET requests at `--path` with `--concurrency`
+requests in flight and reports throughput and latency percentiles.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def _worker(client: httpx.AsyncClient, path: str, queue: asyncio.Queue, latencies: list, errors: list):
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(url: str, path: str, total: int, concurrency: int, token: str | None):
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    latencies: list[float] = []
+    errors: list = []
+
+    async with httpx.AsyncClient(base_url=url, headers=headers, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(_worker(client, path, queue, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"requests:    {len(latencies)} ({len(errors)} errors)")
+    print(f"elapsed:     {elapsed:.2f}s")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} req/s")
+    print(f"p50 latency: {quantiles[49] * 1000:.1f} ms")
+    print(f"p95 latency: {quantiles[94] * 1000:.1f} ms")
+    print(f"p99 latency: {quantiles[98] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/tasks/")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--token", default=None, help="Bearer token for authenticated paths")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.path, args.requests, args.concurrency, args.token))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Compare throughput of the task listing serialization paths.
+
+Runs the previous GET /tasks/ implementation (ORM objects, one
+TaskResponse.model_validate per row, JSONResponse encoding) against the
+current one (Core column rows dumped straight to JSON bytes by
+rows_response) on the database configured by the usual DATABASE_* /
+DATABASE_URL variables:
+
+    python benchmarks/bench_list_serialization.py --sizes 1000 10000 100000
+
+A throwaway user, project and max(sizes) tasks are created and removed
+afterwards. Fetch and serialization time are reported separately so the
+serializer's share of the request is visible.
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select
+
+from app.database import SessionLocal
+from app.models import Project, Task, User
+from app.routes.tasks import TASK_RESPONSE_FIELDS
+from app.schemas.fields import rows_response
+from app.schemas.task import TaskResponse
+
+
+def seed_tasks(db, project_id, user_id, count, batch=5000):
+    start = datetime.utcnow()
+    for offset in range(0, count, batch):
+        db.execute(
+            insert(Task),
+            [
+                dict(
+                    id=str(uuid4()),
+                    title=f"Benchmark task {i}",
+                    description="x" * 200,
+                    projectId=project_id,
+                    creatorId=user_id,
+                    assigneeId=user_id,
+                    status="TODO",
+                    priority="MEDIUM",
+                    position=i,
+                    createdAt=start + timedelta(milliseconds=i),
+                    updatedAt=start + timedelta(milliseconds=i),
+                )
+                for i in range(offset, min(offset + batch, count))
+            ],
+        )
+    db.commit()
+
+
+def legacy_list(db, project_id, size):
+    query = select(Task).where(Task.projectId == project_id).order_by(Task.createdAt, Task.id).limit(size)
+    fetched = time.perf_counter()
+    tasks = db.scalars(query).all()
+    fetched = time.perf_counter() - fetched
+    serialized = time.perf_counter()
+    # What FastAPI did with the returned list: validate against the
+    # response_model, then encode through jsonable_encoder and json.dumps
+    content = [TaskResponse.model_validate(task) for task in tasks]
+    body = json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+    return fetched, time.perf_counter() - serialized, len(body)
+
+
+def rows_list(db, project_id, size):
+    columns = [getattr(Task, name) for name in TASK_RESPONSE_FIELDS]
+    query = select(*columns).where(Task.projectId == project_id).order_by(Task.createdAt, Task.id).limit(size)
+    fetched = time.perf_counter()
+    rows = db.execute(query).all()
+    fetched = time.perf_counter() - fetched
+    serialized = time.perf_counter()
+    body = rows_response(TaskResponse, TASK_RESPONSE_FIELDS, rows, Response()).body
+    return fetched, time.perf_counter() - serialized, len(body)
+
+
+def measure(name, fn, project_id, size, repeat):
+    fetch, serialize = [], []
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            fetched, serialized, length = fn(db, project_id, size)
+        fetch.append(fetched)
+        serialize.append(serialized)
+    fetched, serialized = statistics.median(fetch), statistics.median(serialize)
+    print(
+        f"{name:<8} rows: {size:>7}  body: {length / 1024:8.0f} KiB  "
+        f"fetch: {fetched * 1000:8.1f} ms  serialize: {serialized * 1000:8.1f} ms  "
+        f"rows/s: {size / (fetched + serialized):>10,.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    user_id, project_id = str(uuid4()), str(uuid4())
+    with SessionLocal() as db:
+        db.add(User(id=user_id, email=f"bench-{user_id}@example.com", password="x", createdAt=now, updatedAt=now))
+        db.flush()
+        db.add(Project(id=project_id, name="Benchmark", ownerId=user_id, createdAt=now, updatedAt=now))
+        db.commit()
+
+    try:
+        with SessionLocal() as db:
+            seed_tasks(db, project_id, user_id, max(args.sizes))
+        for size in args.sizes:
+            measure("legacy", legacy_list, project_id, size, args.repeat)
+            measure("rows", rows_list, project_id, size, args.repeat)
+    finally:
+        with SessionLocal() as db:
+            db.execute(Task.__table__.delete().where(Task.projectId == project_id))
+            db.execute(Project.__table__.delete().where(Project.id == project_id))
+            db.execute(User.__table__.delete().where(User.id == user_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
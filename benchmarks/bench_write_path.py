@@ -0,0 +1,147 @@
+"""Compare statement counts and latency of the task write paths.
+
+Runs the previous create/update implementations (lookups, ORM flush,
+commit, refresh) against the current INSERT/UPDATE ... RETURNING ones on
+the database configured by the usual DATABASE_* / DATABASE_URL variables:
+
+    python benchmarks/bench_write_path.py --iterations 200
+
+A throwaway user and project are created and removed afterwards. Round
+trips are statements plus the COMMIT.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import event, insert, select, update
+
+from app.database import SessionLocal, engine
+from app.models import Project, Task, User
+
+
+class StatementCounter:
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._statement)
+        event.listen(engine, "commit", self._commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._statement)
+        event.remove(engine, "commit", self._commit)
+
+    def _statement(self, *args):
+        self.statements += 1
+
+    def _commit(self, *args):
+        self.commits += 1
+
+
+def _task_values(project_id, user_id):
+    now = datetime.utcnow()
+    return dict(
+        id=str(uuid4()),
+        title="Benchmark task",
+        description="x" * 200,
+        projectId=project_id,
+        creatorId=user_id,
+        assigneeId=user_id,
+        status="TODO",
+        priority="MEDIUM",
+        position=0,
+        createdAt=now,
+        updatedAt=now,
+    )
+
+
+def legacy_create(db, project_id, user_id):
+    db.scalar(select(Project).where(Project.id == project_id))
+    db.scalar(select(User).where(User.id == user_id))
+    task = Task(**_task_values(project_id, user_id))
+    db.add(task)
+    db.commit()
+    db.refresh(task)
+    return task.id
+
+
+def returning_create(db, project_id, user_id):
+    task = db.scalar(insert(Task).values(**_task_values(project_id, user_id)).returning(Task))
+    task_id = task.id
+    db.commit()
+    return task_id
+
+
+def legacy_update(db, task_id, user_id):
+    task = db.scalar(select(Task).where(Task.id == task_id))
+    db.scalar(select(User).where(User.id == user_id))
+    task.status = "IN_PROGRESS"
+    task.assigneeId = user_id
+    task.updatedAt = datetime.utcnow()
+    db.commit()
+    db.refresh(task)
+
+
+def returning_update(db, task_id, user_id):
+    db.scalar(
+        update(Task)
+        .where(Task.id == task_id)
+        .values(status="IN_PROGRESS", assigneeId=user_id, updatedAt=datetime.utcnow())
+        .returning(Task)
+    )
+    db.commit()
+
+
+def measure(name, fn, iterations, args_for):
+    latencies = []
+    results = []
+    with StatementCounter() as counter:
+        for i in range(iterations):
+            db = SessionLocal()
+            try:
+                start = time.perf_counter()
+                results.append(fn(db, *args_for(i)))
+                latencies.append(time.perf_counter() - start)
+            finally:
+                db.close()
+    print(
+        f"{name:<18} statements/op: {counter.statements / iterations:4.1f}  "
+        f"round trips/op: {(counter.statements + counter.commits) / iterations:4.1f}  "
+        f"p50: {statistics.median(latencies) * 1000:6.2f} ms"
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    user_id, project_id = str(uuid4()), str(uuid4())
+    with SessionLocal() as db:
+        db.add(User(id=user_id, email=f"bench-{user_id}@example.com", password="x", createdAt=now, updatedAt=now))
+        db.flush()
+        db.add(Project(id=project_id, name="Benchmark", ownerId=user_id, createdAt=now, updatedAt=now))
+        db.commit()
+
+    try:
+        same = lambda i: (project_id, user_id)
+        legacy_ids = measure("legacy create", legacy_create, args.iterations, same)
+        new_ids = measure("returning create", returning_create, args.iterations, same)
+        measure("legacy update", legacy_update, args.iterations, lambda i: (legacy_ids[i], user_id))
+        measure("returning update", returning_update, args.iterations, lambda i: (new_ids[i], user_id))
+    finally:
+        with SessionLocal() as db:
+            db.execute(Task.__table__.delete().where(Task.projectId == project_id))
+            db.execute(Project.__table__.delete().where(Project.id == project_id))
+            db.execute(User.__table__.delete().where(User.id == user_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
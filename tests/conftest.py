@@ -7,7 +7,8 @@ from fastapi.testclient import TestClient
 from dotenv import load_dotenv
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, ThreadpoolSession, enable_strict_loading, get_db
+from app.utils import query_budget, realtime
 
 load_dotenv()
 
@@ -27,6 +28,18 @@ engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(monkeypatch):
+    """Fail any request that issues more statements than its route's @query_budget."""
+    monkeypatch.setattr(query_budget, "QUERY_BUDGET_STRICT", True)
+
+
+@pytest.fixture(autouse=True)
+def realtime_in_process(monkeypatch):
+    """Deliver realtime events in-process; no LISTEN connection runs under the test client."""
+    monkeypatch.setattr(realtime, "REALTIME_BACKEND", "local")
+
+
 @pytest.fixture(scope="function")
 def db():
     """Create test database and session."""
@@ -42,10 +55,13 @@ def db():
 def client(db):
     """Create FastAPI test client with test database."""
     def override_get_db():
+        # Strict like production with DATABASE_STRICT_LOADING: lazy loads in routes raise
+        session = TestingSessionLocal()
+        enable_strict_loading(session)
         try:
-            yield db
+            yield ThreadpoolSession(session)
         finally:
-            db.close()
+            session.close()
 
     app.dependency_overrides[get_db] = override_get_db
     yield TestClient(app)
@@ -1,5 +1,27 @@
+import asyncio
+import gc
+import threading
+import time
+
+import httpx
 import pytest
 from fastapi import status
+from sqlalchemy import event, update
+
+from app.main import app
+from app.database import ThreadpoolSession, get_db
+from app.dependencies.auth import principal_cache, refresh_token_versions
+from app.models import User
+from app.utils import jwt
+from app.utils.revocation import token_versions
+from app.utils.security import (
+    BcryptPool,
+    PasswordHasherBusy,
+    choose_bcrypt_rounds,
+    hash_rounds,
+    needs_rehash,
+)
+from tests.conftest import TestingSessionLocal, engine
 
 
 class TestUserCreation:
@@ -54,6 +76,17 @@ class TestUserCreation:
         assert data["lastName"] is None
 
 
+class TestUserListing:
+    """Tests for the user list endpoint."""
+
+    def test_fields(self, client, test_user):
+        """Test ?fields= limits the user response to the listed fields."""
+        response = client.get("/users/", params={"fields": "email"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{"id": test_user["user"]["id"], "email": "test@example.com"}]
+
+
 class TestLogin:
     """Tests for login endpoint."""
 
@@ -114,6 +147,127 @@ class TestLogin:
         assert data["access_token"].count(".") == 2
 
 
+class TestPasswordHashingPool:
+    """Tests for the bounded bcrypt worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Test submissions beyond workers + max_queue raise PasswordHasherBusy."""
+        pool = BcryptPool(workers=1, max_queue=0)
+        release = threading.Event()
+        try:
+            blocked = asyncio.ensure_future(pool.run(release.wait))
+            await asyncio.sleep(0.05)
+
+            with pytest.raises(PasswordHasherBusy):
+                await pool.run(lambda: None)
+            assert pool.stats()["rejected"] == 1
+
+            release.set()
+            assert await blocked is True
+            assert await pool.run(lambda: "ok") == "ok"
+        finally:
+            release.set()
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_keeps_its_slot_until_the_job_ends(self):
+        """Test a job whose caller went away still counts against the queue limit."""
+        pool = BcryptPool(workers=1, max_queue=0)
+        release = threading.Event()
+        try:
+            abandoned = asyncio.ensure_future(pool.run(release.wait))
+            await asyncio.sleep(0.05)
+            abandoned.cancel()
+            await asyncio.sleep(0)
+
+            # The job is still running in the pool
+            with pytest.raises(PasswordHasherBusy):
+                await asyncio.wait_for(pool.run(lambda: None), 1)
+
+            release.set()
+            for _ in range(100):
+                if pool.stats()["running"] == 0 and pool._pending == 0:
+                    break
+                await asyncio.sleep(0.01)
+            assert await pool.run(lambda: "ok") == "ok"
+        finally:
+            release.set()
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_records_timings(self):
+        """Test queue-wait and hash-time histograms are recorded."""
+        pool = BcryptPool(workers=1, max_queue=1)
+        try:
+            await pool.run(time.sleep, 0.02)
+            stats = pool.stats()
+            assert stats["hash_seconds"]["count"] == 1
+            assert stats["hash_seconds"]["sum"] >= 0.02
+            assert stats["queue_wait_seconds"]["count"] == 1
+            assert stats["queued"] == 0
+        finally:
+            pool.shutdown()
+
+    def test_login_returns_503_when_saturated(self, client, test_user, monkeypatch):
+        """Test login is shed with 503 and Retry-After while the pool is full."""
+        pool = BcryptPool(workers=1, max_queue=0)
+        pool._pending = 1
+        monkeypatch.setattr("app.utils.security.bcrypt_pool", pool)
+
+        response = client.post("/users/login", json={
+            "email": test_user["credentials"]["email"],
+            "password": test_user["credentials"]["password"],
+        })
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
+
+
+class TestAdaptiveBcryptCost:
+    """Tests for bcrypt work factor calibration and rehash-on-login."""
+
+    def test_choose_rounds_fits_target(self):
+        """Test the chosen cost is the largest whose estimate fits the target."""
+        # 25ms at cost 10 -> 50ms at 11, 100ms at 12, 200ms at 13, 400ms at 14
+        assert choose_bcrypt_rounds(0.025, 10, 0.25, 10, 16) == 13
+
+    def test_choose_rounds_is_clamped(self):
+        """Test the cost never drops below the minimum or exceeds the maximum."""
+        assert choose_bcrypt_rounds(1.0, 10, 0.25, 12, 16) == 12
+        assert choose_bcrypt_rounds(0.0001, 10, 0.25, 12, 16) == 16
+
+    def test_needs_rehash(self, monkeypatch):
+        """Test weaker hashes are upgraded and much stronger ones downgraded."""
+        monkeypatch.setattr("app.utils.security.bcrypt_rounds", 12)
+        assert needs_rehash("$2b$11$" + "a" * 53)
+        assert not needs_rehash("$2b$12$" + "a" * 53)
+        assert not needs_rehash("$2b$13$" + "a" * 53)
+        assert needs_rehash("$2b$14$" + "a" * 53)
+        assert not needs_rehash("not-a-bcrypt-hash")
+
+    def test_login_rehashes_to_current_cost(self, client, db, test_user, monkeypatch):
+        """Test a successful login re-creates a hash whose cost differs from the target."""
+        monkeypatch.setattr("app.utils.security.bcrypt_rounds", 4)
+
+        response = client.post("/users/login", json={
+            "email": test_user["credentials"]["email"],
+            "password": test_user["credentials"]["password"],
+        })
+        assert response.status_code == status.HTTP_200_OK
+
+        db.expire_all()
+        user = db.get(User, test_user["user"]["id"])
+        assert hash_rounds(user.password) == 4
+
+        # The rehashed password still works
+        response = client.post("/users/login", json={
+            "email": test_user["credentials"]["email"],
+            "password": test_user["credentials"]["password"],
+        })
+        assert response.status_code == status.HTTP_200_OK
+
+
 class TestProtectedEndpoints:
     """Tests for authentication on protected endpoints."""
 
@@ -212,6 +366,143 @@ class TestProtectedEndpoints:
         assert response2.status_code == status.HTTP_201_CREATED
 
 
+def _user_lookups(request):
+    """Run request() and return the User SELECTs it issued."""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        request()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return [s for s in statements if s.lstrip().startswith("SELECT") and 'FROM "User"' in s]
+
+
+class TestPrincipalCache:
+    """Tests for the authenticated-principal cache."""
+
+    def test_repeat_requests_skip_user_lookup(self, client, test_user):
+        """Test a second request with the same token is served from the cache."""
+        principal_cache.clear()
+        create = lambda: client.post("/projects/", json={"name": "P"}, headers=test_user["headers"])
+        hits_before = principal_cache.hits
+
+        assert len(_user_lookups(create)) == 1
+        assert len(_user_lookups(create)) == 0
+        assert principal_cache.hits == hits_before + 1
+
+    def test_deleted_user_is_invalidated(self, client, db, test_user):
+        """Test deleting a user evicts their cached principal."""
+        headers = test_user["headers"]
+        assert client.post("/projects/", json={"name": "P"}, headers=headers).status_code == status.HTTP_201_CREATED
+        # Drop the project so the user row can be deleted
+        user = db.get(User, test_user["user"]["id"])
+        for project in user.Project:
+            db.delete(project)
+        db.delete(user)
+        db.commit()
+
+        response = client.post("/projects/", json={"name": "P"}, headers=headers)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "User not found"
+
+
+class TestTokenRevocation:
+    """Tests for stateless tokens and token-version revocation."""
+
+    @pytest.fixture
+    def stateless(self, monkeypatch):
+        monkeypatch.setattr(jwt, "TOKEN_MODE", "stateless")
+        principal_cache.clear()
+        yield
+        token_versions.replace({})
+
+    def _login(self, client, test_user):
+        response = client.post("/users/login", json={
+            "email": test_user["credentials"]["email"],
+            "password": test_user["credentials"]["password"],
+        })
+        assert response.status_code == status.HTTP_200_OK
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def test_stateless_token_skips_user_lookup(self, client, test_user, stateless):
+        """Test a stateless token authenticates from its claims alone."""
+        headers = self._login(client, test_user)
+        payload = jwt.decode_access_token_payload(headers["Authorization"].split()[1])
+        assert payload["email"] == test_user["credentials"]["email"]
+        assert payload["ver"] == 0
+
+        create = lambda: client.post("/projects/", json={"name": "P"}, headers=headers)
+        assert _user_lookups(create) == []
+
+    def test_revoked_token_is_rejected(self, client, test_user):
+        """Test revoking tokens rejects the old token but not a new login."""
+        principal_cache.clear()
+        old_headers = test_user["headers"]
+
+        response = client.post("/users/me/revoke-tokens", headers=old_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = client.get("/projects/", headers=old_headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "Token has been revoked"
+        assert client.get("/projects/", headers=self._login(client, test_user)).status_code == status.HTTP_200_OK
+        token_versions.replace({})
+
+    def test_stateless_revocation_from_refreshed_map(self, client, db, test_user, stateless):
+        """Test a revocation made elsewhere applies once the map is refreshed."""
+        headers = self._login(client, test_user)
+        assert client.get("/projects/", headers=headers).status_code == status.HTTP_200_OK
+
+        # Simulate another worker revoking the tokens
+        user = db.get(User, test_user["user"]["id"])
+        user.tokenVersion = 1
+        db.commit()
+        asyncio.run(refresh_token_versions(ThreadpoolSession(db)))
+
+        response = client.get("/projects/", headers=headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "Token has been revoked"
+
+    def test_cached_reference_token_revoked_from_refreshed_map(self, client, db, test_user):
+        """Test a cached reference-mode principal revoked elsewhere is rejected after a refresh."""
+        principal_cache.clear()
+        headers = test_user["headers"]
+        assert client.get("/projects/", headers=headers).status_code == status.HTTP_200_OK
+
+        # Another worker revokes the tokens; a Core UPDATE skips this process's cache invalidation
+        db.execute(update(User).where(User.id == test_user["user"]["id"]).values(tokenVersion=1))
+        db.commit()
+        assert client.get("/projects/", headers=headers).status_code == status.HTTP_200_OK
+        asyncio.run(refresh_token_versions(ThreadpoolSession(db)))
+
+        response = client.get("/projects/", headers=headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "Token has been revoked"
+        token_versions.replace({})
+
+    def test_stateless_deleted_user_from_refreshed_map(self, client, db, test_user, stateless):
+        """Test a user deleted by another worker is revoked once the map is refreshed."""
+        headers = self._login(client, test_user)
+        db.delete(db.get(User, test_user["user"]["id"]))
+        db.commit()
+        # Another worker never saw the delete
+        token_versions.replace({})
+        principal_cache.clear()
+        assert client.get("/projects/", headers=headers).status_code == status.HTTP_200_OK
+
+        principal_cache.clear()
+        asyncio.run(refresh_token_versions(ThreadpoolSession(db)))
+
+        response = client.get("/projects/", headers=headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "Token has been revoked"
+
+
 class TestTokenExpiration:
     """Tests for token expiration and validation."""
 
@@ -325,3 +616,63 @@ class TestAuthenticationFlow:
 
         # Verify users are different
         assert user1_id != user2_id
+
+
+class TestAuthenticationConcurrency:
+    """Tests that authenticated requests do not stall the event loop."""
+
+    # Simulated network round trip added to every statement
+    DB_LATENCY = 0.05
+
+    @pytest.mark.asyncio
+    async def test_concurrent_authenticated_requests_do_not_block_event_loop(self, client, test_user):
+        """Event-loop lag stays well below one DB round trip under concurrent auth."""
+        def per_request_db():
+            db = ThreadpoolSession(TestingSessionLocal())
+            try:
+                yield db
+            finally:
+                db.sync_session.close()
+
+        def slow_statement(*args):
+            time.sleep(self.DB_LATENCY)
+
+        app.dependency_overrides[get_db] = per_request_db
+        event.listen(engine, "before_cursor_execute", slow_statement)
+
+        max_lag = 0.0
+        done = asyncio.Event()
+
+        async def measure_lag():
+            nonlocal max_lag
+            interval = 0.005
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(interval)
+                max_lag = max(max_lag, time.perf_counter() - start - interval)
+
+        # Keep collector pauses out of the lag measurement
+        gc.collect()
+        gc.disable()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                monitor = asyncio.create_task(measure_lag())
+                responses = await asyncio.gather(*(
+                    async_client.post(
+                        "/projects/",
+                        json={"name": f"Concurrent Project {i}"},
+                        headers=test_user["headers"],
+                    )
+                    for i in range(10)
+                ))
+                done.set()
+                await monitor
+        finally:
+            gc.enable()
+            event.remove(engine, "before_cursor_execute", slow_statement)
+
+        assert all(r.status_code == status.HTTP_201_CREATED for r in responses)
+        assert all(r.json()["ownerId"] == test_user["user"]["id"] for r in responses)
+        # A lookup on the event loop would stall it for at least DB_LATENCY
+        assert max_lag < self.DB_LATENCY
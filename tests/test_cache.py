@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+import pytest
+
+from app.utils.cache import TTLCache
+from app.utils.response_cache import MemoryBackend, response_cache
+
+
+class TestTTLCache:
+    """Tests for the in-process TTL/LRU cache."""
+
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_entries_expire(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1, expires_at=time.monotonic() - 1)
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+    def test_least_recently_used_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_discard_where(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.discard_where(lambda value: value == 1) == 1
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+    def test_disabled_when_size_zero(self):
+        cache = TTLCache(maxsize=0, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+
+    def test_byte_limit_evicts_oldest(self):
+        cache = TTLCache(maxsize=10, ttl=60, max_bytes=10)
+        cache.set("a", b"12345")
+        cache.set("b", b"12345")
+        cache.set("c", b"123")
+        cache.set("big", b"12345678901")
+
+        assert cache.get("a") is None
+        assert cache.get("b") == b"12345"
+        assert cache.get("big") is None
+        assert cache.stats()["bytes"] == 8
+
+
+class TestResponseCache:
+    """Tests for the versioned response cache on task and project reads."""
+
+    @pytest.fixture(autouse=True)
+    def memory_cache(self, monkeypatch):
+        monkeypatch.setattr(response_cache, "backend", MemoryBackend(100, 1024 * 1024, 60))
+
+    @pytest.fixture
+    def project_id(self, client, test_user):
+        response = client.post("/projects/", json={"name": "Board"}, headers=test_user["headers"])
+        return response.json()["id"]
+
+    def _create_task(self, client, test_user, project_id, title="Task"):
+        response = client.post(
+            "/tasks/", json={"title": title, "projectId": project_id}, headers=test_user["headers"]
+        )
+        assert response.status_code == 201
+        return response.json()
+
+    def test_second_read_is_served_without_queries(self, client, test_user, project_id):
+        task = self._create_task(client, test_user, project_id)
+
+        first = client.get(f"/tasks/{task['id']}")
+        second = client.get(f"/tasks/{task['id']}")
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json() == task
+        assert '"0 queries"' in second.headers["Server-Timing"]
+
+    def test_cached_response_honours_if_none_match(self, client, test_user, project_id):
+        task = self._create_task(client, test_user, project_id)
+        etag = client.get(f"/tasks/{task['id']}").headers["ETag"]
+
+        response = client.get(f"/tasks/{task['id']}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert '"0 queries"' in response.headers["Server-Timing"]
+
+    def test_task_write_invalidates_project_listing(self, client, test_user, project_id):
+        task = self._create_task(client, test_user, project_id)
+        assert client.get("/tasks/", params={"project_id": project_id}).headers["X-Cache"] == "MISS"
+        assert client.get("/tasks/", params={"project_id": project_id}).headers["X-Cache"] == "HIT"
+
+        client.patch(f"/tasks/{task['id']}", json={"title": "Renamed"}, headers=test_user["headers"])
+        listing = client.get("/tasks/", params={"project_id": project_id})
+        assert listing.headers["X-Cache"] == "MISS"
+        assert [item["title"] for item in listing.json()] == ["Renamed"]
+        assert client.get(f"/tasks/{task['id']}").json()["title"] == "Renamed"
+
+        self._create_task(client, test_user, project_id, title="Second")
+        assert len(client.get("/tasks/", params={"project_id": project_id}).json()) == 2
+
+        client.delete(f"/tasks/{task['id']}", headers=test_user["headers"])
+        assert client.get(f"/tasks/{task['id']}").status_code == 404
+        assert len(client.get("/tasks/", params={"project_id": project_id}).json()) == 1
+
+    def test_params_are_part_of_the_key(self, client, test_user, project_id):
+        self._create_task(client, test_user, project_id)
+        client.get("/tasks/", params={"project_id": project_id})
+
+        sparse = client.get("/tasks/", params={"project_id": project_id, "fields": "id,title"})
+        assert sparse.headers["X-Cache"] == "MISS"
+        assert set(sparse.json()[0]) == {"id", "title"}
+
+    def test_listing_without_project_is_not_cached(self, client, test_user, project_id):
+        self._create_task(client, test_user, project_id)
+        assert "X-Cache" not in client.get("/tasks/").headers
+
+    def test_projects_cached_per_user(self, client, test_user, project_id):
+        assert client.get("/projects/", headers=test_user["headers"]).headers["X-Cache"] == "MISS"
+        assert client.get("/projects/", headers=test_user["headers"]).headers["X-Cache"] == "HIT"
+
+        client.post("/projects/", json={"name": "Another"}, headers=test_user["headers"])
+        projects = client.get("/projects/", headers=test_user["headers"])
+        assert projects.headers["X-Cache"] == "MISS"
+        assert len(projects.json()) == 2
+
+    def test_evicted_scope_gets_a_fresh_version(self):
+        backend = MemoryBackend(100, 1024, 60, max_scopes=1)
+        first = asyncio.run(backend.versions(["project:a"]))
+        asyncio.run(backend.versions(["project:b"]))
+        assert asyncio.run(backend.versions(["project:a"])) != first
@@ -0,0 +1,296 @@
+import asyncio
+import json
+import os
+import pstats
+import re
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.utils import prometheus, slow_queries
+from app.utils.pool_metrics import PoolMetrics, TimedQueuePool
+from app.utils.profiling import _TaskProfile, request_profiler
+from tests.conftest import engine as test_engine
+
+
+class TestPoolMetrics:
+    """Tests for connection pool instrumentation."""
+
+    def test_checkout_counters_and_wait_time(self):
+        engine = create_engine(test_engine.url, poolclass=TimedQueuePool, pool_size=2, max_overflow=0)
+        metrics = PoolMetrics("test")
+        metrics.attach(engine.pool)
+        try:
+            with engine.connect():
+                snapshot = metrics.snapshot()
+                assert snapshot["checked_out"] == 1
+                assert snapshot["size"] == 2
+
+            snapshot = metrics.snapshot()
+            assert snapshot["checked_out"] == 0
+            assert snapshot["idle"] == 1
+            assert snapshot["connects"] == 1
+            assert snapshot["checkouts"] == 1
+            assert snapshot["checkins"] == 1
+            assert snapshot["checkout_wait_seconds"]["count"] == 1
+            assert snapshot["checkout_wait_seconds"]["buckets"]["+Inf"] == 1
+        finally:
+            engine.dispose()
+
+    def test_checkout_timeout_is_counted(self):
+        engine = create_engine(
+            test_engine.url,
+            poolclass=TimedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        metrics = PoolMetrics("test")
+        metrics.attach(engine.pool)
+        try:
+            with engine.connect():
+                with pytest.raises(PoolTimeoutError):
+                    engine.connect()
+            snapshot = metrics.snapshot()
+            assert snapshot["timeouts"] == 1
+            assert snapshot["checkout_wait_seconds"]["sum"] >= 0.05
+        finally:
+            engine.dispose()
+
+
+class TestPoolEndpoint:
+    """Tests for the internal pool metrics endpoint."""
+
+    def test_hidden_without_configured_token(self, client, monkeypatch):
+        monkeypatch.delenv("INTERNAL_API_TOKEN", raising=False)
+        response = client.get("/internal/pool")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_rejects_wrong_token(self, client, monkeypatch):
+        monkeypatch.setenv("INTERNAL_API_TOKEN", "internal-secret")
+        response = client.get("/internal/pool", headers={"X-Internal-Token": "wrong"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_returns_primary_pool(self, client, monkeypatch):
+        monkeypatch.setenv("INTERNAL_API_TOKEN", "internal-secret")
+        response = client.get("/internal/pool", headers={"X-Internal-Token": "internal-secret"})
+        assert response.status_code == status.HTTP_200_OK
+        primary = response.json()["pools"]["primary"]
+        assert "checked_out" in primary
+        assert "checkout_wait_seconds" in primary
+
+
+def _sample(text, name, **labels):
+    """Return the value of one sample in a Prometheus exposition, or None."""
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    pattern = "^" + re.escape(f"{name}{{{label_text}}}" if labels else name) + r" (\S+)$"
+    match = re.search(pattern, text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+class TestMetricsEndpoint:
+    """Tests for the Prometheus /metrics endpoint."""
+
+    @pytest.fixture
+    def scrape(self, client, monkeypatch):
+        monkeypatch.setenv("INTERNAL_API_TOKEN", "internal-secret")
+
+        def get():
+            response = client.get("/metrics", headers={"Authorization": "Bearer internal-secret"})
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+            return response.text
+        return get
+
+    def test_requires_internal_token(self, client, monkeypatch):
+        monkeypatch.setenv("INTERNAL_API_TOKEN", "internal-secret")
+        response = client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_requests_labelled_by_route_template(self, client, scrape, test_user):
+        labels = {"method": "GET", "route": "/tasks/{task_id}", "status": "404"}
+        before = _sample(scrape(), "http_requests_total", **labels) or 0
+
+        for _ in range(2):
+            client.get(f"/tasks/{os.urandom(4).hex()}", headers=test_user["headers"])
+
+        text = scrape()
+        assert _sample(text, "http_requests_total", **labels) == before + 2
+        assert _sample(text, "http_request_duration_seconds_bucket", method="GET", route="/tasks/{task_id}", le="+Inf") >= 2
+        # The scrape itself is still in flight while it renders
+        assert _sample(text, "http_requests_in_flight", method="GET", route="/metrics") == 1
+
+    def test_pool_and_bcrypt_metrics(self, scrape):
+        text = scrape()
+        assert "# TYPE db_pool_checkouts_total counter" in text
+        assert _sample(text, "db_pool_checked_out", pool="primary") is not None
+        assert _sample(text, "bcrypt_pool_queue_depth") == 0
+        assert "# TYPE bcrypt_pool_hash_seconds histogram" in text
+
+    def test_multiple_workers_are_summed(self, tmp_path):
+        families = {
+            "http_requests_total": {"type": "counter", "help": "Requests.", "samples": [["", {"route": "/"}, 3]]},
+            "http_requests_in_flight": {"type": "gauge", "help": "In flight.", "samples": [["", {"route": "/"}, 1]]},
+        }
+        prometheus.write_worker_snapshot(str(tmp_path), families)
+        # A second, exited worker: its counters count, its gauges don't
+        exited_pid = 2 ** 22 + 1
+        (tmp_path / f"worker-{exited_pid}.json").write_text(
+            json.dumps({"pid": exited_pid, "families": families})
+        )
+
+        text = prometheus.render(prometheus.aggregate(str(tmp_path)))
+
+        assert _sample(text, "http_requests_total", route="/") == 6
+        assert _sample(text, "http_requests_in_flight", route="/") == 1
+
+
+class TestSlowQueryLog:
+    """Tests for the slow query log and its internal endpoint."""
+
+    @pytest.fixture
+    def log_everything(self, monkeypatch):
+        # Any positive threshold below a statement's duration
+        monkeypatch.setattr(slow_queries, "SLOW_QUERY_THRESHOLD", 1e-9)
+        slow_queries.slow_query_log.clear()
+        yield
+        slow_queries.slow_query_log.clear()
+
+    def test_slow_queries_recorded_with_route_and_redacted_parameters(self, client, test_user, monkeypatch, log_everything):
+        monkeypatch.setenv("INTERNAL_API_TOKEN", "internal-secret")
+        client.get(
+            "/tasks/",
+            params={"project_id": "secret-project-id"},
+            headers=test_user["headers"],
+        )
+
+        response = client.get("/internal/slow-queries", headers={"X-Internal-Token": "internal-secret"})
+
+        assert response.status_code == status.HTTP_200_OK
+        queries = response.json()["queries"]
+        task_queries = [q for q in queries if q["route"] == "/tasks/" and 'FROM "Task"' in q["statement"]]
+        # The validator aggregate, then the page of rows
+        assert len(task_queries) == 2
+        assert all(q["duration_ms"] >= 0 for q in task_queries)
+        assert "secret-project-id" not in response.text
+        assert all("<str>" in json.dumps(q["parameters"]) for q in task_queries)
+        # Newest first
+        assert queries[0]["recorded_at"] >= queries[-1]["recorded_at"]
+
+    def test_disabled_with_zero_threshold(self, monkeypatch):
+        monkeypatch.setattr(slow_queries, "SLOW_QUERY_THRESHOLD", 0)
+        slow_queries.slow_query_log.clear()
+        with test_engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1")
+        assert slow_queries.slow_query_log.recent() == []
+
+    def test_only_plain_reads_are_explained(self):
+        assert slow_queries._explainable('SELECT "Task".id FROM "Task"')
+        assert slow_queries._explainable("WITH t AS (SELECT 1) SELECT * FROM t")
+        assert not slow_queries._explainable('UPDATE "Task" SET title = %(title)s')
+        assert not slow_queries._explainable('SELECT id FROM "Task" FOR UPDATE')
+
+    def test_explained_statements_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(slow_queries, "SLOW_QUERY_EXPLAIN_TRACKED", 3)
+        log = slow_queries.SlowQueryLog(10)
+        conn = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+        try:
+            assert log._should_explain(conn, "SELECT 1")
+            # Once per statement per interval
+            assert not log._should_explain(conn, "SELECT 1")
+
+            for size in range(10):
+                log._should_explain(conn, f"SELECT id FROM t WHERE id IN ({', '.join(['%s'] * size)})")
+            assert log._explained.stats()["size"] == 3
+        finally:
+            log.shutdown()
+
+
+class TestRequestProfiling:
+    """Tests for on-demand request profiling."""
+
+    @pytest.fixture
+    def profiler(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("INTERNAL_API_TOKEN", "internal-secret")
+        monkeypatch.setattr(request_profiler, "directory", str(tmp_path))
+        monkeypatch.setattr(request_profiler, "armed", {})
+        monkeypatch.setattr(request_profiler, "skipped", 0)
+        monkeypatch.setattr(request_profiler, "_started", deque())
+        return request_profiler
+
+    def test_profile_header_writes_pstats(self, client, test_user, profiler, tmp_path):
+        response = client.get("/projects/", headers={**test_user["headers"], "X-Profile": "internal-secret"})
+
+        assert response.status_code == status.HTTP_200_OK
+        filename = response.headers["X-Profile-File"]
+        assert "-GET-projects-" in filename
+        stats = pstats.Stats(str(tmp_path / filename))
+        profiled_files = {path for path, _, _ in stats.stats}
+        assert any(path.endswith("routes/projects.py") for path in profiled_files)
+        # Database work done in threadpool workers is merged in
+        assert any("sqlalchemy" in path for path in profiled_files)
+
+    @pytest.mark.asyncio
+    async def test_other_tasks_on_the_loop_are_not_profiled(self):
+        def profiled_work():
+            return sum(range(1000))
+
+        def unrelated_work():
+            return sum(range(1000))
+
+        async def request():
+            for _ in range(5):
+                profiled_work()
+                await asyncio.sleep(0)
+            return "done"
+
+        async def other_request():
+            for _ in range(5):
+                unrelated_work()
+                await asyncio.sleep(0)
+
+        task_profile = _TaskProfile()
+
+        async def profiled():
+            return await task_profile.run(request())
+
+        result, _ = await asyncio.gather(profiled(), other_request())
+
+        assert result == "done"
+        functions = {name for _, _, name in pstats.Stats(task_profile.profile).stats}
+        assert "profiled_work" in functions
+        assert "unrelated_work" not in functions
+
+    def test_wrong_token_is_not_profiled(self, client, profiler, tmp_path):
+        response = client.get("/", headers={"X-Profile": "wrong"})
+
+        assert "X-Profile-File" not in response.headers
+        assert list(tmp_path.iterdir()) == []
+
+    def test_rate_limited(self, client, profiler, monkeypatch):
+        monkeypatch.setattr(profiler, "max_per_minute", 1)
+        headers = {"X-Profile": "internal-secret"}
+
+        assert "X-Profile-File" in client.get("/", headers=headers).headers
+        assert "X-Profile-File" not in client.get("/", headers=headers).headers
+        assert profiler.skipped == 1
+
+    def test_armed_route_profiles_next_requests(self, client, profiler):
+        response = client.post(
+            "/internal/profiling",
+            json={"route": "/tasks/{task_id}", "requests": 1},
+            headers={"X-Internal-Token": "internal-secret"},
+        )
+        assert response.json() == {"armed": {"/tasks/{task_id}": 1}}
+
+        assert "X-Profile-File" not in client.get("/tasks/").headers
+        assert "X-Profile-File" in client.get("/tasks/missing").headers
+        assert "X-Profile-File" not in client.get("/tasks/missing").headers
+
+        state = client.get("/internal/profiling", headers={"X-Internal-Token": "internal-secret"}).json()
+        assert state["armed"] == {}
+        assert len(state["profiles"]) == 1
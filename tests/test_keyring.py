@@ -0,0 +1,104 @@
+import json
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from jose import jwt as jose_jwt
+
+from app.utils import jwt
+from app.utils.keyring import Keyring, parse_key
+
+
+def _pem_pair(private_key):
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return private_pem, public_pem
+
+
+@pytest.fixture
+def use_keyring(monkeypatch):
+    def install(keyring):
+        monkeypatch.setattr(jwt, "keyring", keyring)
+    return install
+
+
+class TestKeyring:
+    """Tests for JWT signing/verification keys and rotation."""
+
+    @pytest.mark.parametrize("algorithm, private_key", [
+        ("ES256", ec.generate_private_key(ec.SECP256R1())),
+        ("EdDSA", Ed25519PrivateKey.generate()),
+    ])
+    def test_asymmetric_round_trip(self, use_keyring, algorithm, private_key):
+        private_pem, _ = _pem_pair(private_key)
+        use_keyring(Keyring([parse_key("k1", algorithm, private_pem)]))
+
+        token = jwt.create_access_token("user-1", {"ver": 2})
+
+        header = jose_jwt.get_unverified_header(token)
+        assert header["alg"] == algorithm
+        assert header["kid"] == "k1"
+        payload = jwt.decode_access_token_payload(token)
+        assert payload["sub"] == "user-1"
+        assert payload["ver"] == 2
+
+    def test_rotation_keeps_old_tokens_valid(self, use_keyring):
+        old_private, old_public = _pem_pair(ec.generate_private_key(ec.SECP256R1()))
+        new_private, _ = _pem_pair(ec.generate_private_key(ec.SECP256R1()))
+        use_keyring(Keyring([parse_key("old", "ES256", old_private)]))
+        old_token = jwt.create_access_token("user-1")
+
+        use_keyring(Keyring(
+            [parse_key("new", "ES256", new_private), parse_key("old", "ES256", old_public)],
+            active_kid="new",
+        ))
+        new_token = jwt.create_access_token("user-1")
+
+        assert jose_jwt.get_unverified_header(new_token)["kid"] == "new"
+        assert jwt.decode_access_token(old_token) == "user-1"
+        assert jwt.decode_access_token(new_token) == "user-1"
+
+        # Once the old key is dropped its tokens are rejected
+        use_keyring(Keyring([parse_key("new", "ES256", new_private)]))
+        assert jwt.decode_access_token(old_token) is None
+
+    def test_algorithm_is_bound_to_key(self, use_keyring):
+        """Test a token can't pick its own algorithm, e.g. HS256 keyed with a public key."""
+        private_pem, public_pem = _pem_pair(ec.generate_private_key(ec.SECP256R1()))
+        use_keyring(Keyring([parse_key("k1", "ES256", private_pem)]))
+
+        forged = jose_jwt.encode({"sub": "admin"}, "secret", algorithm="HS256", headers={"kid": "k1"})
+
+        assert jwt.decode_access_token(forged) is None
+
+    def test_active_key_must_be_able_to_sign(self):
+        _, public_pem = _pem_pair(Ed25519PrivateKey.generate())
+
+        with pytest.raises(ValueError):
+            Keyring([parse_key("k1", "EdDSA", public_pem)])
+
+    def test_from_file(self, tmp_path):
+        private_pem, _ = _pem_pair(Ed25519PrivateKey.generate())
+        (tmp_path / "ed.pem").write_text(private_pem)
+        (tmp_path / "keyring.json").write_text(json.dumps({
+            "active": "ed",
+            "keys": [
+                {"kid": "ed", "alg": "EdDSA", "key_file": str(tmp_path / "ed.pem")},
+                {"kid": "legacy", "alg": "HS256", "key": "legacy-secret"},
+            ],
+        }))
+
+        keyring = Keyring.from_file(str(tmp_path / "keyring.json"))
+
+        assert len(keyring) == 2
+        assert keyring.active.kid == "ed"
+        assert keyring.verification_key("legacy").algorithm == "HS256"
+        assert keyring.verification_key("unknown") is None
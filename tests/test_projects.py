@@ -0,0 +1,98 @@
+from datetime import datetime
+from uuid import uuid4
+from fastapi import status
+
+from app.models import ProjectMember
+
+
+def _login(client, email):
+    client.post("/users/", json={"email": email, "password": "password123"})
+    response = client.post("/users/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class TestProjectListing:
+    """Tests for the project list endpoint."""
+
+    def test_list_projects_without_token(self, client):
+        """Test listing projects without token returns 401 or 403."""
+        response = client.get("/projects/")
+
+        assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+
+    def test_list_only_own_projects(self, client, test_user):
+        """Test users only see projects they own."""
+        other_headers = _login(client, "other@projects.com")
+        client.post("/projects/", json={"name": "Mine"}, headers=test_user["headers"])
+        client.post("/projects/", json={"name": "Theirs"}, headers=other_headers)
+
+        response = client.get("/projects/", headers=test_user["headers"])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [project["name"] for project in response.json()] == ["Mine"]
+
+    def test_list_includes_member_projects(self, client, db, test_user):
+        """Test projects the user is a member of are listed."""
+        other_headers = _login(client, "owner@projects.com")
+        shared = client.post("/projects/", json={"name": "Shared"}, headers=other_headers).json()
+        client.post("/projects/", json={"name": "Private"}, headers=other_headers)
+
+        db.add(ProjectMember(
+            id=str(uuid4()),
+            projectId=shared["id"],
+            userId=test_user["user"]["id"],
+            role="MEMBER",
+            joinedAt=datetime.utcnow(),
+        ))
+        db.commit()
+
+        response = client.get("/projects/", headers=test_user["headers"])
+
+        assert [project["id"] for project in response.json()] == [shared["id"]]
+
+    def test_pagination(self, client, test_user):
+        """Test following X-Next-Cursor returns every project exactly once."""
+        project_ids = [
+            client.post("/projects/", json={"name": f"Project {i}"}, headers=test_user["headers"]).json()["id"]
+            for i in range(3)
+        ]
+
+        first = client.get("/projects/", params={"limit": 2}, headers=test_user["headers"])
+        assert len(first.json()) == 2
+        second = client.get(
+            "/projects/",
+            params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+            headers=test_user["headers"],
+        )
+        assert "X-Next-Cursor" not in second.headers
+
+        seen = [project["id"] for project in first.json() + second.json()]
+        assert sorted(seen) == sorted(project_ids)
+
+    def test_invalid_cursor(self, client, test_user):
+        """Test a malformed cursor returns 400."""
+        response = client.get("/projects/", params={"cursor": "bogus"}, headers=test_user["headers"])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_fields(self, client, test_user):
+        """Test ?fields= limits the project response to the listed fields."""
+        client.post("/projects/", json={"name": "Sparse", "description": "Hidden"}, headers=test_user["headers"])
+
+        response = client.get("/projects/", params={"fields": "name"}, headers=test_user["headers"])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.json()[0]) == {"id", "name"}
+
+    def test_not_modified_until_a_project_is_created(self, client, test_user):
+        """Test the listing ETag answers If-None-Match with 304 until the set changes."""
+        client.post("/projects/", json={"name": "First"}, headers=test_user["headers"])
+        etag = client.get("/projects/", headers=test_user["headers"]).headers["ETag"]
+
+        unchanged = client.get("/projects/", headers={**test_user["headers"], "If-None-Match": etag})
+        assert unchanged.status_code == status.HTTP_304_NOT_MODIFIED
+
+        client.post("/projects/", json={"name": "Second"}, headers=test_user["headers"])
+        changed = client.get("/projects/", headers={**test_user["headers"], "If-None-Match": etag})
+        assert changed.status_code == status.HTTP_200_OK
+        assert len(changed.json()) == 2
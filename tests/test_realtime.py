@@ -0,0 +1,129 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy.orm import Session
+from starlette.websockets import WebSocketDisconnect
+
+from app.routes.realtime import SLOW_CONSUMER_CLOSE_CODE, _event_stream
+from app.schemas.task import TaskResponse
+from app.utils import realtime
+from app.utils.realtime import Broker, broker, stage_events, task_deleted_event, task_event
+from tests.conftest import engine
+
+
+def _task(project_id="p1", description=None) -> TaskResponse:
+    return TaskResponse(
+        id="t1", title="T", description=description, projectId=project_id, creatorId="u1",
+        assigneeId=None, status="TODO", priority="LOW", position=0, dueDate=None,
+        createdAt="2026-01-01T00:00:00", updatedAt="2026-01-01T00:00:00",
+    )
+
+
+class TestRealtimeEvents:
+    """Tests for task events pushed over WebSocket and SSE."""
+
+    @pytest.fixture
+    def project_id(self, client, test_user):
+        return client.post("/projects/", json={"name": "Board"}, headers=test_user["headers"]).json()["id"]
+
+    def test_websocket_streams_task_events(self, client, test_user, project_id):
+        other_project = client.post("/projects/", json={"name": "Other"}, headers=test_user["headers"]).json()["id"]
+
+        with client.websocket_connect(f"/ws/projects/{project_id}") as websocket:
+            client.post("/tasks/", json={"title": "Elsewhere", "projectId": other_project}, headers=test_user["headers"])
+            task = client.post(
+                "/tasks/", json={"title": "T", "projectId": project_id}, headers=test_user["headers"]
+            ).json()
+            client.patch(f"/tasks/{task['id']}", json={"status": "DONE"}, headers=test_user["headers"])
+            client.delete(f"/tasks/{task['id']}", headers=test_user["headers"])
+
+            created = websocket.receive_json()
+            assert created["type"] == "task.created"
+            assert created["task"] == task
+            updated = websocket.receive_json()
+            assert (updated["type"], updated["task"]["status"]) == ("task.updated", "DONE")
+            assert websocket.receive_json() == {"type": "task.deleted", "id": task["id"]}
+
+        assert broker.stats()["subscribers"] == 0
+
+    def test_bulk_writes_publish_one_event_per_task(self, client, test_user, project_id):
+        with client.websocket_connect(f"/ws/projects/{project_id}") as websocket:
+            client.post(
+                "/tasks/bulk",
+                json={"tasks": [{"title": f"T{i}", "projectId": project_id} for i in range(3)]},
+                headers=test_user["headers"],
+            )
+            titles = [websocket.receive_json()["task"]["title"] for _ in range(3)]
+        assert titles == ["T0", "T1", "T2"]
+
+    def test_slow_websocket_subscriber_is_closed(self, client, project_id, monkeypatch):
+        monkeypatch.setattr(broker, "queue_size", 1)
+
+        with client.websocket_connect(f"/ws/projects/{project_id}") as websocket:
+            subscription = next(iter(broker._subscribers[project_id]))
+            wire = task_event("task.updated", _task(project_id))
+            # A burst arriving before the socket is written to overflows the queue
+            subscription.loop.call_soon_threadsafe(lambda: [broker.dispatch(wire) for _ in range(3)])
+
+            with pytest.raises(WebSocketDisconnect) as excinfo:
+                websocket.receive_json()
+        assert excinfo.value.code == SLOW_CONSUMER_CLOSE_CODE
+        assert broker.stats()["dropped"] >= 1
+
+    def test_sse_stream(self):
+        async def read():
+            stream = _event_stream("p1")
+            first = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0)
+            broker.dispatch(task_deleted_event("t1", "p1"))
+            event = await first
+            await stream.aclose()
+            return event
+
+        event = asyncio.run(read())
+        assert event == 'data: {"type": "task.deleted", "id": "t1"}\n\n'
+        assert broker.stats()["subscribers"] == 0
+
+
+class TestBroker:
+    """Tests for the in-process pub/sub and event encoding."""
+
+    def test_full_queue_drops_subscriber(self):
+        async def run():
+            local = Broker(queue_size=2)
+            subscription = local.subscribe("p1")
+            for i in range(3):
+                local.dispatch(f'p1 {{"n":{i}}}')
+            return await subscription.get(), subscription.dropped, local.stats()
+
+        message, dropped, stats = asyncio.run(run())
+        assert message is None
+        assert dropped is True
+        assert (stats["delivered"], stats["dropped"]) == (2, 1)
+
+    def test_oversized_task_is_sent_as_partial_event(self):
+        wire = task_event("task.updated", _task(description="x" * 10000))
+        project_id, _, message = wire.partition(" ")
+        event = json.loads(message)
+
+        assert project_id == "p1"
+        assert len(wire.encode()) <= realtime.MAX_NOTIFY_PAYLOAD
+        assert event["partial"] is True
+        assert event["task"]["id"] == "t1"
+
+    def test_rolled_back_events_are_discarded(self, db):
+        async def run():
+            subscription = broker.subscribe("p1")
+            try:
+                with Session(engine) as session:
+                    session.connection()
+                    stage_events(session, [task_deleted_event("t1", "p1")])
+                    session.rollback()
+                    stage_events(session, [task_deleted_event("t2", "p1")])
+                    session.commit()
+                return await asyncio.wait_for(subscription.get(), 1)
+            finally:
+                broker.unsubscribe(subscription)
+
+        assert json.loads(asyncio.run(run()))["id"] == "t2"
@@ -0,0 +1,63 @@
+import logging
+import re
+
+from fastapi import status
+from sqlalchemy import event, text
+
+from app.utils.request_stats import current_request_stats, track_request
+from tests.conftest import engine
+
+
+def _server_timing(response):
+    match = re.fullmatch(
+        r'db;dur=([\d.]+);desc="(\d+) queries", total;dur=([\d.]+)',
+        response.headers["Server-Timing"],
+    )
+    assert match is not None
+    return float(match.group(1)), int(match.group(2)), float(match.group(3))
+
+
+class TestRequestStats:
+    """Tests for per-request SQL statement counting and the Server-Timing header."""
+
+    def test_statements_counted_outside_requests_are_ignored(self):
+        assert current_request_stats() is None
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        with track_request() as stats:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+        assert stats.queries == 2
+        assert stats.db_time > 0
+        assert current_request_stats() is None
+
+    def test_server_timing_matches_statement_count(self, client, test_user):
+        statements = []
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = client.get("/projects/", headers=test_user["headers"])
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert response.status_code == status.HTTP_200_OK
+        db_ms, queries, total_ms = _server_timing(response)
+        assert queries == len(statements)
+        assert queries > 0
+        assert db_ms <= total_ms
+
+    def test_request_without_queries(self, client):
+        response = client.get("/")
+
+        assert _server_timing(response)[1] == 0
+
+    def test_request_log_line(self, client, test_user, caplog):
+        with caplog.at_level(logging.INFO, logger="app.requests"):
+            client.get("/projects/", headers=test_user["headers"])
+
+        [line] = [record.getMessage() for record in caplog.records if record.name == "app.requests"]
+        assert line.startswith("method=GET path=/projects/ status=200 ")
+        assert re.search(r"db_queries=[1-9]\d* db_ms=[\d.]+$", line)
@@ -1,6 +1,15 @@
 import pytest
 from fastapi import status
 from datetime import datetime, timedelta
+from sqlalchemy import event, update
+
+from app.models import Task
+from app.routes import tasks as task_routes
+from app.schemas.task import MAX_BULK_TASKS
+from app.utils import delta_sync, jwt
+from app.utils.conditional import http_date
+from app.utils.pagination import encode_cursor
+from tests.conftest import engine
 
 
 class TestTaskCreation:
@@ -98,6 +107,24 @@ class TestTaskCreation:
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert "Assignee not found" in response.json()["detail"]
 
+    def test_create_task_for_deleted_creator(self, client, test_user, monkeypatch):
+        """Test a stateless token whose user no longer exists gets 401, not 500."""
+        project_response = client.post("/projects/", json={"name": "Test Project"}, headers=test_user["headers"])
+        project_id = project_response.json()["id"]
+        monkeypatch.setattr(jwt, "TOKEN_MODE", "stateless")
+        # Name the constraint as Postgres does
+        monkeypatch.setattr(task_routes, "violated_constraint", lambda error: "Task_creatorId_fkey")
+        token = jwt.create_access_token("deleted-user-id", {"email": "gone@example.com", "ver": 0})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = client.post("/tasks/", json={"title": "T", "projectId": project_id}, headers=headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "User not found"
+
+        response = client.post("/tasks/bulk", json={"tasks": [{"title": "T", "projectId": project_id}]}, headers=headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "User not found"
+
     def test_create_task_with_assignee(self, client):
         """Test creating task with valid assignee."""
         # Create two users
@@ -172,9 +199,95 @@ class TestTaskCreation:
         assert response.json()["dueDate"] is not None
 
 
+class TestTaskBulkCreation:
+    """Tests for the bulk task creation endpoint."""
+
+    def test_bulk_create_success(self, client, test_user):
+        """Test creating many tasks returns one result per item in order."""
+        project_id = client.post("/projects/", json={"name": "Import"}, headers=test_user["headers"]).json()["id"]
+        tasks = [{"title": f"Imported {i}", "projectId": project_id, "priority": "HIGH"} for i in range(25)]
+
+        response = client.post("/tasks/bulk", json={"tasks": tasks}, headers=test_user["headers"])
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["succeeded"] == 25
+        assert data["failed"] == 0
+        assert [result["index"] for result in data["results"]] == list(range(25))
+        assert [result["task"]["title"] for result in data["results"]] == [t["title"] for t in tasks]
+        assert all(result["task"]["creatorId"] == test_user["user"]["id"] for result in data["results"])
+
+        listed = client.get("/tasks/", params={"project_id": project_id})
+        assert len(listed.json()) == 25
+
+    def test_bulk_create_full_batch(self, client, test_user):
+        """Test a full-size batch, inserted in several statements, is created in full."""
+        project_id = client.post("/projects/", json={"name": "Import"}, headers=test_user["headers"]).json()["id"]
+        tasks = [{"title": f"Imported {i}", "projectId": project_id} for i in range(MAX_BULK_TASKS)]
+
+        response = client.post("/tasks/bulk", json={"tasks": tasks}, headers=test_user["headers"])
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["succeeded"] == MAX_BULK_TASKS
+        assert data["results"][-1]["task"]["title"] == f"Imported {MAX_BULK_TASKS - 1}"
+
+    def test_bulk_create_partial_failure(self, client, test_user):
+        """Test items with missing references fail while the rest are created."""
+        project_id = client.post("/projects/", json={"name": "Import"}, headers=test_user["headers"]).json()["id"]
+        tasks = [
+            {"title": "Good", "projectId": project_id, "assigneeId": test_user["user"]["id"]},
+            {"title": "Bad project", "projectId": "nonexistent-project-id"},
+            {"title": "Bad assignee", "projectId": project_id, "assigneeId": "nonexistent-user-id"},
+        ]
+
+        response = client.post("/tasks/bulk", json={"tasks": tasks}, headers=test_user["headers"])
+
+        data = response.json()
+        assert data["succeeded"] == 1
+        assert data["failed"] == 2
+        assert data["results"][0]["ok"] is True
+        assert data["results"][1] == {"index": 1, "ok": False, "task": None, "error": "Project not found"}
+        assert data["results"][2]["error"] == "Assignee not found"
+
+        listed = client.get("/tasks/", params={"project_id": project_id})
+        assert [task["title"] for task in listed.json()] == ["Good"]
+
+    def test_bulk_create_empty(self, client, test_user):
+        """Test an empty batch is rejected."""
+        response = client.post("/tasks/bulk", json={"tasks": []}, headers=test_user["headers"])
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def test_bulk_create_without_token(self, client):
+        """Test bulk creation without token returns 401 or 403."""
+        response = client.post("/tasks/bulk", json={"tasks": [{"title": "x", "projectId": "p"}]})
+
+        assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+
+
 class TestTaskRetrieval:
     """Tests for task retrieval endpoints."""
 
+    def test_list_serializes_like_task_response(self, client, test_user):
+        """Test the row-based list serialization matches TaskResponse byte for byte."""
+        project_id = client.post("/projects/", json={"name": "P"}, headers=test_user["headers"]).json()["id"]
+        task_id = client.post("/tasks/", json={
+            "title": "Ünïcode \"quoted\"",
+            "projectId": project_id,
+            "assigneeId": test_user["user"]["id"],
+            "status": "IN_REVIEW",
+            "priority": "URGENT",
+            "dueDate": "2026-05-01T12:30:00.250000",
+        }, headers=test_user["headers"]).json()["id"]
+        client.post("/tasks/", json={"title": "Bare", "projectId": project_id}, headers=test_user["headers"])
+
+        listing = client.get("/tasks/", params={"project_id": project_id})
+        singles = [client.get(f"/tasks/{task['id']}").content for task in listing.json()]
+
+        assert listing.json()[0]["id"] == task_id
+        assert listing.content == b"[" + b",".join(singles) + b"]"
+
     def test_get_task_success(self, client, test_user):
         """Test getting a specific task."""
         # Create project and task
@@ -314,6 +427,168 @@ class TestTaskRetrieval:
         assert all(task["status"] == "TODO" for task in data)
 
 
+class TestTaskPagination:
+    """Tests for keyset pagination on the task list endpoint."""
+
+    def _create_tasks(self, client, headers, count):
+        project_response = client.post(
+            "/projects/",
+            json={"name": "Paginated Project"},
+            headers=headers
+        )
+        project_id = project_response.json()["id"]
+        task_ids = []
+        for i in range(count):
+            response = client.post(
+                "/tasks/",
+                json={"title": f"Task {i}", "projectId": project_id},
+                headers=headers
+            )
+            task_ids.append(response.json()["id"])
+        return project_id, task_ids
+
+    def test_pages_cover_all_tasks_once(self, client, test_user):
+        """Test following X-Next-Cursor returns every task exactly once."""
+        project_id, task_ids = self._create_tasks(client, test_user["headers"], 5)
+
+        seen = []
+        params = {"project_id": project_id, "limit": 2}
+        pages = 0
+        while True:
+            response = client.get("/tasks/", params=params)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.json()) <= 2
+            seen.extend(task["id"] for task in response.json())
+            pages += 1
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if not next_cursor:
+                break
+            params["cursor"] = next_cursor
+
+        assert pages == 3
+        assert sorted(seen) == sorted(task_ids)
+        assert len(seen) == len(set(seen))
+
+    def test_last_page_has_no_cursor(self, client, test_user):
+        """Test a page holding the remaining tasks carries no next cursor."""
+        project_id, _ = self._create_tasks(client, test_user["headers"], 2)
+
+        response = client.get("/tasks/", params={"project_id": project_id, "limit": 2})
+
+        assert len(response.json()) == 2
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_order_by_position(self, client, test_user):
+        """Test paginating by position returns tasks ordered by (position, id)."""
+        project_id, task_ids = self._create_tasks(client, test_user["headers"], 3)
+
+        first = client.get("/tasks/", params={"project_id": project_id, "order": "position", "limit": 2})
+        second = client.get("/tasks/", params={
+            "project_id": project_id,
+            "order": "position",
+            "limit": 2,
+            "cursor": first.headers["X-Next-Cursor"],
+        })
+
+        ids = [task["id"] for task in first.json() + second.json()]
+        assert ids == sorted(task_ids)
+
+    def test_cursor_from_other_order_rejected(self, client, test_user):
+        """Test a cursor is only valid for the ordering that produced it."""
+        project_id, _ = self._create_tasks(client, test_user["headers"], 2)
+        first = client.get("/tasks/", params={"project_id": project_id, "limit": 1})
+
+        response = client.get("/tasks/", params={
+            "project_id": project_id,
+            "order": "position",
+            "cursor": first.headers["X-Next-Cursor"],
+        })
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_invalid_cursor(self, client):
+        """Test a malformed cursor returns 400."""
+        response = client.get("/tasks/", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "Invalid cursor" in response.json()["detail"]
+
+    @pytest.mark.parametrize("sort_value", ["1", {"x": 1}, True, 1.5, None])
+    def test_position_cursor_with_wrong_type_rejected(self, client, sort_value):
+        """Test a tampered position cursor returns 400 rather than reaching the database."""
+        cursor = encode_cursor("position", sort_value, "some-id")
+        response = client.get("/tasks/", params={"order": "position", "cursor": cursor})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_limit_above_cap(self, client):
+        """Test limit above the maximum page size is rejected."""
+        response = client.get("/tasks/", params={"limit": 10000})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+class TestTaskFieldSelection:
+    """Tests for ?fields= sparse fieldsets on the task list endpoint."""
+
+    def _create_task(self, client, headers):
+        project_id = client.post("/projects/", json={"name": "Board"}, headers=headers).json()["id"]
+        client.post(
+            "/tasks/",
+            json={"title": "Card", "description": "Long description", "projectId": project_id},
+            headers=headers
+        )
+        return project_id
+
+    def test_only_requested_fields_returned(self, client, test_user):
+        """Test the response contains only the requested fields plus id."""
+        project_id = self._create_task(client, test_user["headers"])
+
+        response = client.get("/tasks/", params={"project_id": project_id, "fields": "title,status,position"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{
+            "id": response.json()[0]["id"],
+            "title": "Card",
+            "status": "TODO",
+            "position": 0,
+        }]
+
+    def test_unrequested_columns_not_selected(self, client, test_user):
+        """Test unrequested columns such as description are not read from the database."""
+        project_id = self._create_task(client, test_user["headers"])
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            client.get("/tasks/", params={"project_id": project_id, "fields": "title"})
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        task_selects = [s for s in statements if 'FROM "Task"' in s]
+        assert task_selects
+        assert all('"Task".description' not in s for s in task_selects)
+
+    def test_unknown_field_rejected(self, client):
+        """Test requesting an unknown field returns 400."""
+        response = client.get("/tasks/", params={"fields": "title,secret"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "secret" in response.json()["detail"]
+
+    def test_fields_keep_pagination_cursor(self, client, test_user):
+        """Test the next cursor header survives the sparse response."""
+        project_id = self._create_task(client, test_user["headers"])
+        client.post("/tasks/", json={"title": "Second", "projectId": project_id}, headers=test_user["headers"])
+
+        response = client.get("/tasks/", params={"project_id": project_id, "fields": "title", "limit": 1})
+
+        assert "X-Next-Cursor" in response.headers
+
+
 class TestTaskUpdate:
     """Tests for task update endpoint."""
 
@@ -461,6 +736,341 @@ class TestTaskUpdate:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+class TestTaskBulkUpdate:
+    """Tests for the bulk task update endpoint."""
+
+    def _create_tasks(self, client, headers, count):
+        project_id = client.post("/projects/", json={"name": "Sprint"}, headers=headers).json()["id"]
+        response = client.post(
+            "/tasks/bulk",
+            json={"tasks": [{"title": f"Task {i}", "projectId": project_id} for i in range(count)]},
+            headers=headers
+        )
+        return [result["task"]["id"] for result in response.json()["results"]]
+
+    def test_shared_patch(self, client, test_user):
+        """Test one patch applied to many tasks."""
+        task_ids = self._create_tasks(client, test_user["headers"], 5)
+
+        response = client.patch(
+            "/tasks/bulk",
+            json={"ids": task_ids, "patch": {"status": "DONE"}},
+            headers=test_user["headers"]
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["succeeded"] == 5
+        assert all(result["task"]["status"] == "DONE" for result in data["results"])
+        for task_id in task_ids:
+            assert client.get(f"/tasks/{task_id}").json()["status"] == "DONE"
+
+    def test_per_task_patches(self, client, test_user):
+        """Test different patches per task, leaving unspecified fields untouched."""
+        task_ids = self._create_tasks(client, test_user["headers"], 2)
+
+        response = client.patch(
+            "/tasks/bulk",
+            json={"updates": [
+                {"id": task_ids[0], "priority": "URGENT"},
+                {"id": task_ids[1], "title": "Renamed", "assigneeId": test_user["user"]["id"]},
+            ]},
+            headers=test_user["headers"]
+        )
+
+        results = response.json()["results"]
+        assert results[0]["task"]["priority"] == "URGENT"
+        assert results[0]["task"]["title"] == "Task 0"
+        assert results[1]["task"]["title"] == "Renamed"
+        assert results[1]["task"]["assigneeId"] == test_user["user"]["id"]
+
+    def test_partial_failure(self, client, test_user):
+        """Test missing tasks, missing assignees and duplicates are reported per item."""
+        task_ids = self._create_tasks(client, test_user["headers"], 2)
+
+        response = client.patch(
+            "/tasks/bulk",
+            json={
+                "ids": [task_ids[0], "nonexistent-task-id"],
+                "patch": {"status": "IN_PROGRESS"},
+                "updates": [
+                    {"id": task_ids[1], "assigneeId": "nonexistent-user-id"},
+                    {"id": task_ids[0], "title": "Again"},
+                ],
+            },
+            headers=test_user["headers"]
+        )
+
+        data = response.json()
+        assert data["succeeded"] == 1
+        assert data["failed"] == 3
+        assert [result["error"] for result in data["results"]] == [
+            None, "Task not found", "Assignee not found", "Duplicate task id"
+        ]
+        assert client.get(f"/tasks/{task_ids[1]}").json()["assigneeId"] is None
+
+    def test_ids_without_patch(self, client, test_user):
+        """Test ids without a patch are rejected."""
+        response = client.patch("/tasks/bulk", json={"ids": ["a"]}, headers=test_user["headers"])
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def test_bulk_update_without_token(self, client):
+        """Test bulk update without token returns 401 or 403."""
+        response = client.patch("/tasks/bulk", json={"ids": ["a"], "patch": {"status": "DONE"}})
+
+        assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+
+
+class TestTaskWriteStatements:
+    """Tests that single-task writes take one statement each after authentication."""
+
+    def _count_statements(self, request):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = request()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        # Ignore the authentication lookup (skipped when the principal is cached)
+        return response, [s for s in statements if 'FROM "User"' not in s]
+
+    def test_create_task_is_one_insert(self, client, test_user):
+        """Test create_task issues a single INSERT ... RETURNING."""
+        project_id = client.post("/projects/", json={"name": "P"}, headers=test_user["headers"]).json()["id"]
+
+        response, statements = self._count_statements(lambda: client.post(
+            "/tasks/",
+            json={"title": "T", "projectId": project_id, "assigneeId": test_user["user"]["id"]},
+            headers=test_user["headers"]
+        ))
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(statements) == 1
+        assert statements[0].startswith("INSERT")
+
+    def test_update_task_is_one_update(self, client, test_user):
+        """Test update_task issues a single UPDATE ... RETURNING."""
+        project_id = client.post("/projects/", json={"name": "P"}, headers=test_user["headers"]).json()["id"]
+        task_id = client.post(
+            "/tasks/", json={"title": "T", "projectId": project_id}, headers=test_user["headers"]
+        ).json()["id"]
+
+        response, statements = self._count_statements(lambda: client.patch(
+            f"/tasks/{task_id}",
+            json={"status": "DONE", "assigneeId": test_user["user"]["id"]},
+            headers=test_user["headers"]
+        ))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "DONE"
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE")
+
+
+class TestTaskConditionalRequests:
+    """Tests for ETag / Last-Modified validators and If-Match on tasks."""
+
+    @pytest.fixture
+    def task(self, client, test_user):
+        project_id = client.post("/projects/", json={"name": "P"}, headers=test_user["headers"]).json()["id"]
+        response = client.post(
+            "/tasks/", json={"title": "T", "projectId": project_id}, headers=test_user["headers"]
+        )
+        assert "ETag" in response.headers
+        return response.json() | {"etag": response.headers["ETag"]}
+
+    def test_get_task_not_modified(self, client, task):
+        response = client.get(f"/tasks/{task['id']}")
+        assert response.headers["ETag"] == task["etag"]
+        assert "Last-Modified" in response.headers
+
+        unchanged = client.get(f"/tasks/{task['id']}", headers={"If-None-Match": task["etag"]})
+        assert unchanged.status_code == status.HTTP_304_NOT_MODIFIED
+        assert unchanged.content == b""
+        assert unchanged.headers["ETag"] == task["etag"]
+
+        since = client.get(
+            f"/tasks/{task['id']}", headers={"If-Modified-Since": response.headers["Last-Modified"]}
+        )
+        assert since.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_update_changes_etag(self, client, test_user, task):
+        updated = client.patch(f"/tasks/{task['id']}", json={"title": "New"}, headers=test_user["headers"])
+        assert updated.headers["ETag"] != task["etag"]
+
+        response = client.get(f"/tasks/{task['id']}", headers={"If-None-Match": task["etag"]})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == "New"
+
+    def test_list_not_modified_without_loading_rows(self, client, test_user, task):
+        params = {"project_id": task["projectId"]}
+        listing = client.get("/tasks/", params=params)
+        etag = listing.headers["ETag"]
+        assert "Last-Modified" not in listing.headers
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = client.get("/tasks/", params=params, headers={"If-None-Match": f'W/"x", {etag}'})
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert len(statements) == 1
+        assert "count(*)" in statements[0]
+
+        # Other filters and pages have their own tags
+        assert client.get("/tasks/", params={**params, "limit": 1}).headers["ETag"] != etag
+
+        client.delete(f"/tasks/{task['id']}", headers=test_user["headers"])
+        response = client.get("/tasks/", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == []
+
+        # A delete moves no remaining updatedAt, so If-Modified-Since is not
+        # honoured on listings
+        client.post("/tasks/", json={"title": "Keep", "projectId": task["projectId"]}, headers=test_user["headers"])
+        doomed = client.post(
+            "/tasks/", json={"title": "Doomed", "projectId": task["projectId"]}, headers=test_user["headers"]
+        ).json()
+        since = http_date(datetime.utcnow() + timedelta(seconds=1))
+        client.delete(f"/tasks/{doomed['id']}", headers=test_user["headers"])
+        response = client.get("/tasks/", params=params, headers={"If-Modified-Since": since})
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["title"] for item in response.json()] == ["Keep"]
+
+    def test_if_match(self, client, test_user, task):
+        first = client.patch(
+            f"/tasks/{task['id']}",
+            json={"title": "First"},
+            headers={**test_user["headers"], "If-Match": task["etag"]},
+        )
+        assert first.status_code == status.HTTP_200_OK
+
+        conflict = client.patch(
+            f"/tasks/{task['id']}",
+            json={"title": "Second"},
+            headers={**test_user["headers"], "If-Match": task["etag"]},
+        )
+        assert conflict.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert client.get(f"/tasks/{task['id']}").json()["title"] == "First"
+
+        current = client.patch(
+            f"/tasks/{task['id']}",
+            json={"title": "Second"},
+            headers={**test_user["headers"], "If-Match": first.headers["ETag"]},
+        )
+        assert current.status_code == status.HTTP_200_OK
+
+    def test_if_match_on_missing_task(self, client, test_user):
+        response = client.patch(
+            "/tasks/missing", json={"title": "X"}, headers={**test_user["headers"], "If-Match": "*"}
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestTaskChanges:
+    """Tests for delta sync through GET /tasks/changes."""
+
+    @pytest.fixture(autouse=True)
+    def no_settle_window(self, monkeypatch):
+        monkeypatch.setattr(delta_sync, "DELTA_SYNC_SETTLE", timedelta(0))
+
+    @pytest.fixture
+    def project_id(self, client, test_user):
+        return client.post("/projects/", json={"name": "Board"}, headers=test_user["headers"]).json()["id"]
+
+    def _create(self, client, test_user, project_id, title):
+        return client.post(
+            "/tasks/", json={"title": title, "projectId": project_id}, headers=test_user["headers"]
+        ).json()
+
+    def test_initial_then_incremental_sync(self, client, test_user, project_id):
+        first = self._create(client, test_user, project_id, "First")
+        second = self._create(client, test_user, project_id, "Second")
+
+        initial = client.get("/tasks/changes", params={"project_id": project_id}).json()
+        assert [task["title"] for task in initial["tasks"]] == ["First", "Second"]
+        assert initial["deleted"] == []
+        assert initial["hasMore"] is False
+
+        idle = client.get("/tasks/changes", params={"project_id": project_id, "since": initial["cursor"]}).json()
+        assert idle["tasks"] == idle["deleted"] == []
+        assert idle["hasMore"] is False
+
+        client.patch(f"/tasks/{first['id']}", json={"status": "DONE"}, headers=test_user["headers"])
+        client.delete(f"/tasks/{second['id']}", headers=test_user["headers"])
+
+        delta = client.get("/tasks/changes", params={"project_id": project_id, "since": initial["cursor"]}).json()
+        assert [(task["id"], task["status"]) for task in delta["tasks"]] == [(first["id"], "DONE")]
+        assert [tombstone["id"] for tombstone in delta["deleted"]] == [second["id"]]
+
+        caught_up = client.get("/tasks/changes", params={"project_id": project_id, "since": delta["cursor"]}).json()
+        assert caught_up["tasks"] == caught_up["deleted"] == []
+
+    def test_pages_merge_updates_and_deletions(self, client, test_user, project_id):
+        tasks = [self._create(client, test_user, project_id, f"Task {i}") for i in range(3)]
+        cursor = client.get("/tasks/changes", params={"project_id": project_id}).json()["cursor"]
+        for task in tasks:
+            client.delete(f"/tasks/{task['id']}", headers=test_user["headers"])
+        self._create(client, test_user, project_id, "New")
+
+        seen = []
+        has_more = True
+        while has_more:
+            page = client.get(
+                "/tasks/changes", params={"project_id": project_id, "since": cursor, "limit": 2}
+            ).json()
+            seen += [("deleted", item["id"]) for item in page["deleted"]]
+            seen += [("task", item["title"]) for item in page["tasks"]]
+            cursor, has_more = page["cursor"], page["hasMore"]
+
+        assert sorted(seen) == sorted([("deleted", task["id"]) for task in tasks] + [("task", "New")])
+
+    def test_recent_changes_are_held_back(self, client, test_user, project_id, monkeypatch):
+        self._create(client, test_user, project_id, "Fresh")
+        monkeypatch.setattr(delta_sync, "DELTA_SYNC_SETTLE", timedelta(hours=1))
+
+        response = client.get("/tasks/changes", params={"project_id": project_id}).json()
+        assert response["tasks"] == []
+
+        # Once settled, the held-back task follows the returned cursor
+        monkeypatch.setattr(delta_sync, "DELTA_SYNC_SETTLE", timedelta(0))
+        response = client.get("/tasks/changes", params={"project_id": project_id, "since": response["cursor"]}).json()
+        assert [task["title"] for task in response["tasks"]] == ["Fresh"]
+
+    def test_idle_board_cursor_does_not_expire(self, client, db, test_user, project_id):
+        task = self._create(client, test_user, project_id, "Old")
+        # The board's only change is older than the retention window
+        db.execute(
+            update(Task).where(Task.id == task["id"]).values(updatedAt=datetime.utcnow() - timedelta(days=365))
+        )
+        db.commit()
+
+        initial = client.get("/tasks/changes", params={"project_id": project_id}).json()
+        assert [task["title"] for task in initial["tasks"]] == ["Old"]
+
+        response = client.get("/tasks/changes", params={"project_id": project_id, "since": initial["cursor"]})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["tasks"] == response.json()["deleted"] == []
+
+    def test_invalid_and_expired_cursors(self, client, project_id):
+        response = client.get("/tasks/changes", params={"project_id": project_id, "since": "bogus"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        expired = encode_cursor(delta_sync.CHANGES_ORDER, datetime.utcnow() - timedelta(days=365), "x")
+        response = client.get("/tasks/changes", params={"project_id": project_id, "since": expired})
+        assert response.status_code == status.HTTP_410_GONE
+
+
 class TestTaskDeletion:
     """Tests for task deletion endpoint."""
 